@@ -0,0 +1,89 @@
+""" Benchmark of the Excel mapping registry under concurrent uploads
+
+Compares unpickling both mapping files on every request with reading them
+from the process-wide registry, for a number of concurrent requests.
+
+Usage: python benchmarks/mapping_registry.py [requests] [threads]
+"""
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+from core_curate_app.pythoncodes import xmlprocessing  # noqa: E402
+
+MAPPING_FILES = ["AM_excel_mapping.pkl", "AM_excel_mapping_R.pkl"]
+
+
+def unpickle_per_request():
+    """Load both mappings the way each request used to.
+
+    Returns:
+
+    """
+    for file_name in MAPPING_FILES:
+        file_path = os.path.join(
+            os.path.dirname(xmlprocessing.__file__), file_name
+        )
+        with open(file_path, "rb") as file:
+            pickle.load(file)
+
+
+def registry_per_request():
+    """Load both mappings from the registry.
+
+    Returns:
+
+    """
+    xmlprocessing.load_dict()
+    xmlprocessing.load_dict_R()
+
+
+def run(request, requests, threads):
+    """Run concurrent requests and return the mean time per request.
+
+    Args:
+        request:
+        requests:
+        threads:
+
+    Returns:
+
+    """
+
+    def timed(_):
+        start = time.perf_counter()
+        request()
+        return time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        durations = list(executor.map(timed, range(requests)))
+    return sum(durations) / len(durations)
+
+
+def main(requests=200, threads=8):
+    """Print the mean mapping load time per request.
+
+    Args:
+        requests:
+        threads:
+
+    Returns:
+
+    """
+    registry_per_request()  # first request pays the load
+    baseline = run(unpickle_per_request, requests, threads)
+    cached = run(registry_per_request, requests, threads)
+    print(f"{requests} requests, {threads} threads")
+    print(f"unpickle per request: {baseline * 1000:8.3f} ms/request")
+    print(f"mapping registry:     {cached * 1000:8.3f} ms/request")
+    print(
+        f"saved:                {(baseline - cached) * 1000:8.3f} ms/request"
+    )
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:3]])
@@ -0,0 +1,129 @@
+""" Benchmark of the memory held by the compiled AsphaltDB test schemas
+
+Compares compiling the six test schema files separately, as each test used
+to, with compiling the schema merged from them. Each variant runs in a fresh
+process and reports the resident memory (RSS, Linux only) and the Python
+heap (tracemalloc) added by the warm-up, after the XSD meta-schema is
+loaded.
+
+Usage: python benchmarks/test_schemas_memory.py [runs]
+"""
+import gc
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), os.pardir))
+
+import xmlschema  # noqa: E402
+
+from core_curate_app.pythoncodes import xmlprocessing  # noqa: E402
+
+VARIANTS = ["separate", "merged"]
+
+
+def resident_memory():
+    """Return the resident memory of the process in MB, None if unknown.
+
+    Returns:
+
+    """
+    try:
+        with open("/proc/self/status", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def warm_up_separate():
+    """Compile each test schema file on its own, with xmlschema and lxml.
+
+    Returns:
+
+    """
+    schemas = []
+    for file_path in xmlprocessing.get_test_schema_paths():
+        with open(file_path, encoding="utf-8") as file:
+            schemas.append(xmlprocessing.compile_schemas(file.read()))
+    return schemas
+
+
+def warm_up_merged():
+    """Compile the merged test schema, with xmlschema and lxml.
+
+    Returns:
+
+    """
+    xmlprocessing.warm_up_test_schemas()
+    return xmlprocessing.schema_registry
+
+
+def measure(variant):
+    """Warm up the schemas of a variant and print the memory it added.
+
+    Args:
+        variant: "separate" or "merged"
+
+    Returns:
+
+    """
+    xmlschema.XMLSchema(
+        '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema"/>'
+    )
+    gc.collect()
+    rss_before = resident_memory()
+    tracemalloc.start()
+    start = time.perf_counter()
+    schemas = warm_up_separate() if variant == "separate" else warm_up_merged()
+    duration = time.perf_counter() - start
+    gc.collect()
+    heap, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resident_memory()
+    rss = None if rss_before is None else rss_after - rss_before
+    print(f"{rss} {heap / 2**20} {duration}")
+    return schemas
+
+
+def main(runs=3):
+    """Print the mean memory added by each variant over fresh processes.
+
+    Args:
+        runs:
+
+    Returns:
+
+    """
+    print(f"{runs} runs per variant, fresh process each")
+    for variant in VARIANTS:
+        results = []
+        for _ in range(runs):
+            output = subprocess.run(
+                [sys.executable, __file__, "--measure", variant],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.split()
+            results.append(
+                [None if value == "None" else float(value) for value in output]
+            )
+        rss = [result[0] for result in results]
+        heap = sum(result[1] for result in results) / runs
+        duration = sum(result[2] for result in results) / runs
+        rss_text = "n/a" if None in rss else f"{sum(rss) / runs:6.1f} MB"
+        print(
+            f"{variant:9} RSS +{rss_text}  Python heap {heap:5.1f} MB  "
+            f"warm-up {duration:5.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--measure"]:
+        measure(sys.argv[2])
+    else:
+        main(*[int(arg) for arg in sys.argv[1:2]])
@@ -1,6 +1,7 @@
 """ Apps file for setting core package when app is ready
 """
 import sys
+import threading
 
 from django.apps import AppConfig
 
@@ -19,5 +20,25 @@ class CurateAppConfig(AppConfig):
         """
         if "migrate" not in sys.argv:
             from core_curate_app.permissions import discover
+            from core_curate_app.settings import (
+                CURATE_EXCEL_SCHEMAS_WARM_UP,
+                CURATE_SCHEMA_DISK_CACHE_DIR,
+            )
 
             discover.init_permissions()
+
+            if CURATE_SCHEMA_DISK_CACHE_DIR:
+                from core_curate_app.pythoncodes.xmlprocessing import (
+                    configure_schema_disk_cache,
+                )
+
+                configure_schema_disk_cache(CURATE_SCHEMA_DISK_CACHE_DIR)
+
+            if CURATE_EXCEL_SCHEMAS_WARM_UP:
+                from core_curate_app.pythoncodes.xmlprocessing import (
+                    warm_up_test_schemas,
+                )
+
+                threading.Thread(
+                    target=warm_up_test_schemas, daemon=True
+                ).start()
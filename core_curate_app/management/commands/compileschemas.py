@@ -0,0 +1,79 @@
+"""Compile schemas command
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from core_curate_app.pythoncodes import xmlprocessing
+from core_curate_app.settings import CURATE_SCHEMA_DISK_CACHE_DIR
+from core_main_app.components.template.models import Template
+
+
+class Command(BaseCommand):
+    help = (
+        "Compile the schemas of active templates and the AsphaltDB schemas "
+        "into the schema disk cache"
+    )
+
+    def add_arguments(self, parser):
+        """add_arguments
+
+        Args:
+            parser:
+
+        Returns:
+
+        """
+        parser.add_argument(
+            "--directory",
+            default=CURATE_SCHEMA_DISK_CACHE_DIR,
+            help="cache directory, CURATE_SCHEMA_DISK_CACHE_DIR by default",
+        )
+
+    def handle(self, *args, **options):
+        """handle
+
+        Args:
+            *args:
+            **options:
+
+        Returns:
+
+        """
+        if not options["directory"]:
+            raise CommandError(
+                "No cache directory: set CURATE_SCHEMA_DISK_CACHE_DIR "
+                "or use --directory."
+            )
+        xmlprocessing.configure_schema_disk_cache(options["directory"])
+        disk_cache = xmlprocessing.schema_disk_cache
+
+        compiled = 0
+        failed = 0
+        templates = Template.objects.filter(
+            format=Template.XSD,
+            is_disabled=False,
+            version_manager__is_disabled=False,
+        )
+        for template in templates:
+            if disk_cache.contains(template.content):
+                continue
+            try:
+                xmlprocessing.compile_xmlschema(
+                    template.content, template.content
+                )
+                compiled += 1
+            except Exception as exception:
+                failed += 1
+                self.stderr.write(
+                    f"Template {template.id} ({template.filename}): "
+                    f"{str(exception)}"
+                )
+
+        for root_name in xmlprocessing.TEST_SCHEMA_FILES:
+            xmlprocessing.get_test_schema(root_name)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{compiled} template schemas compiled, {failed} failed, "
+                f"AsphaltDB schemas compiled in {disk_cache.directory}."
+            )
+        )
@@ -0,0 +1,103 @@
+"""Convert workbooks command
+"""
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core_curate_app.pythoncodes.conversion import convert_directory
+from core_curate_app.pythoncodes.xmlprocessing import SHEET_EXCEL_TYPES
+from core_curate_app.settings import CURATE_EXCEL_STREAMING_READER
+
+
+class Command(BaseCommand):
+    help = (
+        "Convert the workbooks of a directory to one XML file per test "
+        "document, in a process pool"
+    )
+
+    def add_arguments(self, parser):
+        """add_arguments
+
+        Args:
+            parser:
+
+        Returns:
+
+        """
+        parser.add_argument("directory", help="directory of the workbooks")
+        parser.add_argument(
+            "output", help="directory of the XML files, created if needed"
+        )
+        parser.add_argument(
+            "--sheet",
+            choices=list(SHEET_EXCEL_TYPES),
+            default="Columns",
+            help="sheet layout of the workbooks, Columns by default",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="number of worker processes, the number of CPUs by default",
+        )
+        parser.add_argument(
+            "--streaming",
+            action="store_true",
+            default=CURATE_EXCEL_STREAMING_READER,
+            help="read the workbooks with the streaming readers",
+        )
+
+    def handle(self, *args, **options):
+        """handle
+
+        Args:
+            *args:
+            **options:
+
+        Returns:
+
+        """
+        if not os.path.isdir(options["directory"]):
+            raise CommandError(f"No such directory: {options['directory']}")
+
+        start = time.perf_counter()
+        workbooks = 0
+        documents = 0
+        failed = 0
+        for result in convert_directory(
+            options["directory"],
+            options["output"],
+            SHEET_EXCEL_TYPES[options["sheet"]],
+            options["workers"],
+            options["streaming"],
+        ):
+            workbooks += 1
+            documents += result["documents"]
+            for error in result["errors"]:
+                location = (
+                    f"row {error['row']}"
+                    if "row" in error
+                    else f"column {error['column']}"
+                )
+                self.stderr.write(
+                    f"{result['path']} ({location}): "
+                    f"{error['stage']} failed: {error['error']}"
+                )
+            if result["error"] is not None:
+                failed += 1
+                self.stderr.write(f"{result['path']}: {result['error']}")
+            self.stdout.write(
+                f"{result['path']}: {result['documents']} documents "
+                f"in {result['seconds']:.1f}s"
+            )
+
+        seconds = time.perf_counter() - start
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{workbooks} workbooks ({failed} failed) converted to "
+                f"{documents} documents in {seconds:.1f}s: "
+                f"{workbooks / seconds if seconds else 0:.2f} workbooks/s, "
+                f"{documents / seconds if seconds else 0:.1f} documents/s."
+            )
+        )
@@ -0,0 +1,218 @@
+""" Bounded caches of objects built from content
+"""
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+logger = logging.getLogger(__name__)
+
+
+class ContentCache:
+    """Thread-safe LRU cache of objects built from versioned content.
+
+    Entries are keyed by an id and the SHA-256 digest of the content they
+    were built from: an object is rebuilt when the content of its id
+    changes, and replaces the object built from the previous content. At
+    most ``max_size`` objects are kept, the least recently used being
+    evicted first. Concurrent requests for the same missing object wait
+    for a single build.
+    """
+
+    def __init__(self, builder, max_size):
+        """Initialize the cache.
+
+        Args:
+            builder: callable building the object from the content
+            max_size: maximum number of objects kept
+
+        """
+        self._builder = builder
+        self._max_size = max_size
+        self._entries = OrderedDict()
+        self._builds = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.builds = 0
+        self.build_time = 0.0
+        self.evictions = 0
+
+    def get(self, key, content):
+        """Return the object built from the content, building it if needed.
+
+        Args:
+            key: id of the content, e.g. a template id
+            content: str or bytes
+
+        Returns:
+
+        """
+        digest = hashlib.sha256(
+            content.encode("utf-8") if isinstance(content, str) else content
+        )
+        version = digest.hexdigest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == version:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            build = self._builds.get((key, version))
+            is_builder = build is None
+            if is_builder:
+                build = Future()
+                self._builds[(key, version)] = build
+
+        if not is_builder:
+            return build.result()
+
+        start = time.perf_counter()
+        try:
+            value = self._builder(content)
+        except BaseException as exception:
+            with self._lock:
+                del self._builds[(key, version)]
+            build.set_exception(exception)
+            raise
+        with self._lock:
+            self.builds += 1
+            self.build_time += time.perf_counter() - start
+            self._entries[key] = (version, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            del self._builds[(key, version)]
+        build.set_result(value)
+        return value
+
+    def stats(self):
+        """Return the counters of the cache.
+
+        Returns:
+
+        """
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self._max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "builds": self.builds,
+                "build_time": self.build_time,
+                "evictions": self.evictions,
+            }
+
+    def clear(self):
+        """Remove all cached objects.
+
+        Returns:
+
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+class PickleCache:
+    """Cache of objects pickled to a directory, keyed by the content they
+    were built from.
+
+    An object is stored in ``<namespace>-<SHA-256 digest of the content>``
+    and loaded instead of being built again, by any process sharing the
+    directory. Files are written atomically, and unreadable files are
+    rebuilt. Pickle files run code when loaded: the directory must only be
+    writable by the server.
+    """
+
+    def __init__(self, directory, namespace):
+        """Initialize the cache, creating the directory if needed.
+
+        Args:
+            directory: path of the cache directory
+            namespace: prefix of the file names, e.g. including the version
+                of the library building the objects
+
+        """
+        self.directory = directory
+        self._namespace = namespace
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, content):
+        """Return the path of the file storing the object built from content.
+
+        Args:
+            content: str or bytes
+
+        Returns:
+
+        """
+        digest = hashlib.sha256(
+            content.encode("utf-8") if isinstance(content, str) else content
+        ).hexdigest()
+        return os.path.join(
+            self.directory, f"{self._namespace}-{digest}.pickle"
+        )
+
+    def contains(self, content):
+        """Check if an object built from content is stored.
+
+        Args:
+            content: str or bytes
+
+        Returns:
+
+        """
+        return os.path.exists(self.path(content))
+
+    def get(self, content, builder):
+        """Return the object built from content, loading it from the
+        directory, or building and storing it.
+
+        Args:
+            content: str or bytes
+            builder: callable with no argument building the object
+
+        Returns:
+
+        """
+        path = self.path(content)
+        try:
+            with open(path, "rb") as file:
+                return pickle.load(file)
+        except Exception:
+            # missing, truncated or incompatible file: built and written again
+            pass
+        value = builder()
+        try:
+            self._write(path, value)
+        except Exception as exception:
+            logger.warning("Unable to write %s: %s", path, str(exception))
+        return value
+
+    def _write(self, path, value):
+        """Write an object to a temporary file, then move it to its path.
+
+        Args:
+            path:
+            value:
+
+        Returns:
+
+        """
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=self.directory, suffix=".tmp"
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
@@ -0,0 +1,141 @@
+""" Conversion of directories of workbooks to XML documents
+"""
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from core_curate_app.pythoncodes import xmlprocessing
+
+WORKBOOK_EXTENSIONS = (".xlsx", ".xlsm")
+
+
+def document_filename(name):
+    """Return the file name of a named test document, e.g. Row_12_Rutting.xml
+    for "Row 12 - Rutting".
+
+    Args:
+        name: name of the document given by iter_xml_final
+
+    Returns:
+
+    """
+    return re.sub(r"\W+", "_", name).strip("_") + ".xml"
+
+
+def find_workbooks(directory):
+    """Return the paths of the workbooks of a directory and its
+    subdirectories, directory by directory in name order, leaving out Excel
+    lock files.
+
+    Args:
+        directory:
+
+    Returns:
+
+    """
+    paths = []
+    for root, dirnames, filenames in os.walk(directory):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.lower().endswith(
+                WORKBOOK_EXTENSIONS
+            ) and not filename.startswith("~$"):
+                paths.append(os.path.join(root, filename))
+    return paths
+
+
+def convert_workbook(path, target_directory, excel_type, streaming=False):
+    """Write the test documents of a workbook to a directory, each one as
+    soon as it is extracted.
+
+    Records that can't be extracted are left out and returned with their
+    Excel row or column. A workbook that can't be read returns its error,
+    with the documents already written.
+
+    Args:
+        path: path of the workbook
+        target_directory: directory of the documents, created if needed
+        excel_type: "C" for a Columns sheet, "R" for a Rows sheet
+        streaming: read the workbook with the streaming readers
+
+    Returns:
+        dict with the path, the number of documents written, the record
+        errors, the workbook error or None and the conversion time
+
+    """
+    start = time.perf_counter()
+    os.makedirs(target_directory, exist_ok=True)
+    documents = 0
+    errors = []
+    error = None
+    try:
+        for name, xml in xmlprocessing.iter_xml_final(
+            path, excel_type, streaming=streaming, errors=errors
+        ):
+            with open(
+                os.path.join(target_directory, document_filename(name)),
+                "w",
+                encoding="utf-8",
+            ) as file:
+                file.write(xml)
+            documents += 1
+    except Exception as exception:
+        error = str(exception)
+    return {
+        "path": path,
+        "documents": documents,
+        "errors": errors,
+        "error": error,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def convert_directory(
+    directory, output_directory, excel_type, workers=0, streaming=False
+):
+    """Yield the result of the conversion of each workbook of a directory,
+    as the workbooks are converted.
+
+    The documents of a workbook are written to a directory of the output
+    directory with the relative path of the workbook, without extension.
+    With workers > 1, workbooks are converted in a pool of processes
+    started by a fork server, as the extraction pool of xmlprocessing, and
+    the results are yielded in completion order.
+
+    Args:
+        directory: directory of the workbooks
+        output_directory:
+        excel_type: "C" for Columns sheets, "R" for Rows sheets
+        workers: number of worker processes
+        streaming: read the workbooks with the streaming readers
+
+    Returns:
+        results of convert_workbook
+
+    """
+    tasks = [
+        (
+            path,
+            os.path.join(
+                output_directory,
+                os.path.splitext(os.path.relpath(path, directory))[0],
+            ),
+            excel_type,
+            streaming,
+        )
+        for path in find_workbooks(directory)
+    ]
+    if workers <= 1:
+        for task in tasks:
+            yield convert_workbook(*task)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("forkserver"),
+    ) as executor:
+        futures = [executor.submit(convert_workbook, *task) for task in tasks]
+        for future in as_completed(futures):
+            yield future.result()
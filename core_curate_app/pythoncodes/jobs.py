@@ -0,0 +1,215 @@
+""" Background jobs run by a local thread pool, their state kept in a cache
+"""
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.cache import caches
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+
+class Job:
+    """State of a background job, updated while its function runs.
+
+    The function reports its progress through ``report``, passed to it as
+    the ``progress`` keyword argument. Each change is passed to
+    ``on_change``, if set, with the job.
+    """
+
+    def __init__(self, owner=None, on_change=None):
+        """Initialize a pending job.
+
+        Args:
+            owner: id of the user who submitted the job
+            on_change: callable called with the job when its state changes
+
+        """
+        self.id = uuid.uuid4().hex
+        self.owner = owner
+        self.on_change = on_change
+        self.status = JOB_PENDING
+        self.stage = None
+        self.rows_processed = 0
+        self.rows_total = None
+        self.result = None
+        self.error = None
+        self.finished_at = None
+
+    def report(self, stage, rows_processed=0, rows_total=None):
+        """Report the progress of the job.
+
+        Args:
+            stage:
+            rows_processed:
+            rows_total: None if unknown
+
+        Returns:
+
+        """
+        self.stage = stage
+        self.rows_processed = rows_processed
+        self.rows_total = rows_total
+        if self.on_change is not None:
+            self.on_change(self)
+
+    def to_dict(self):
+        """Return the status of the job, with its result once done.
+
+        Returns:
+
+        """
+        status = {
+            "job_id": self.id,
+            "status": self.status,
+            "stage": self.stage,
+            "rows_processed": self.rows_processed,
+            "rows_total": self.rows_total,
+        }
+        if self.status == JOB_DONE:
+            status["result"] = self.result
+        elif self.status == JOB_FAILED:
+            status["error"] = self.error
+        return status
+
+    def to_state(self):
+        """Return the state of the job, as stored in the cache.
+
+        Returns:
+
+        """
+        return dict(self.to_dict(), owner=self.owner)
+
+    @classmethod
+    def from_state(cls, state):
+        """Return a job with a state read from the cache.
+
+        Args:
+            state: dict returned by to_state
+
+        Returns:
+
+        """
+        job = cls(state["owner"])
+        job.id = state["job_id"]
+        job.status = state["status"]
+        job.stage = state["stage"]
+        job.rows_processed = state["rows_processed"]
+        job.rows_total = state["rows_total"]
+        job.result = state.get("result")
+        job.error = state.get("error")
+        return job
+
+
+class JobManager:
+    """Run jobs in a thread pool of the current process and keep their state
+    in a Django cache.
+
+    The status, progress and result of a job are written to the cache each
+    time they change, and kept for ``ttl`` seconds after the last change.
+    Any process sharing the cache can get them, e.g. the other workers of a
+    server when the cache is shared between them.
+    """
+
+    def __init__(self, max_workers, ttl, cache_alias="default"):
+        """Initialize the manager, the thread pool is started on first use.
+
+        Args:
+            max_workers: number of jobs run at the same time
+            ttl: seconds the state of a job is kept after its last change
+            cache_alias: alias of the Django cache keeping the jobs
+
+        """
+        self._max_workers = max_workers
+        self._ttl = ttl
+        self._cache_alias = cache_alias
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, function, *args, owner=None, **kwargs):
+        """Submit a job running function(*args, progress=..., **kwargs).
+
+        Args:
+            function:
+            *args:
+            owner: id of the user submitting the job
+            **kwargs:
+
+        Returns:
+
+        """
+        job = Job(owner, on_change=self._store)
+        self._store(job)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="curate_job",
+                )
+            self._executor.submit(self._run, job, function, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        """Return the last stored state of a job, None if unknown or expired.
+
+        Args:
+            job_id:
+
+        Returns:
+
+        """
+        state = caches[self._cache_alias].get(self._key(job_id))
+        return None if state is None else Job.from_state(state)
+
+    def _key(self, job_id):
+        """Return the cache key of a job.
+
+        Args:
+            job_id:
+
+        Returns:
+
+        """
+        return f"curate_excel_job:{job_id}"
+
+    def _store(self, job):
+        """Write the state of a job to the cache.
+
+        Args:
+            job:
+
+        Returns:
+
+        """
+        caches[self._cache_alias].set(
+            self._key(job.id), job.to_state(), timeout=self._ttl
+        )
+
+    def _run(self, job, function, args, kwargs):
+        """Run the function of a job and store its result or error.
+
+        Args:
+            job:
+            function:
+            args:
+            kwargs:
+
+        Returns:
+
+        """
+        job.status = JOB_RUNNING
+        self._store(job)
+        try:
+            job.result = function(*args, progress=job.report, **kwargs)
+            job.status = JOB_DONE
+        except Exception as exception:
+            job.error = str(exception)
+            job.status = JOB_FAILED
+        try:
+            self._store(job)
+        finally:
+            job.finished_at = time.monotonic()
@@ -0,0 +1,104 @@
+""" Compiled plans for the Excel to XML mappings
+"""
+import logging
+import xml.etree.ElementTree as ET
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class MappingPlan:
+    """Column to XML paths mapping compiled into a path trie.
+
+    Trie nodes are numbered, the root being 0: ``tags`` and ``parents`` give
+    the tag and parent node of each node. ``columns`` lists each mapped
+    column, in mapping order, with the node chains of its dotted paths.
+    """
+
+    def __init__(self, col_to_paths):
+        """Compile the mapping.
+
+        Args:
+            col_to_paths: dict of column header tuple to list of dotted paths
+
+        """
+        self.tags = [None]
+        self.parents = [None]
+        self.columns = []
+        children = [{}]
+        for column, paths in col_to_paths.items():
+            chains = []
+            for path in paths:
+                node = 0
+                chain = []
+                for part in path.split("."):
+                    child = children[node].get(part)
+                    if child is None:
+                        child = len(self.tags)
+                        self.tags.append(part)
+                        self.parents.append(node)
+                        children.append({})
+                        children[node][part] = child
+                    chain.append(child)
+                    node = child
+                chains.append(tuple(chain))
+            self.columns.append((column, tuple(chains)))
+
+    def resolve(self, columns):
+        """Return the position of each mapped column in a columns index.
+
+        When a column appears several times, its first position is used.
+
+        Args:
+            columns: pandas index of the DataFrame columns
+
+        Returns:
+            list of positions, None for columns missing from the index
+
+        """
+        positions = []
+        for column, _ in self.columns:
+            if column not in columns:
+                logger.warning("Column '%s' not found in DataFrame.", column)
+                positions.append(None)
+                continue
+            location = columns.get_loc(column)
+            if isinstance(location, slice):
+                location = location.start
+            elif not isinstance(location, (int, np.integer)):
+                location = np.flatnonzero(location)[0]
+            positions.append(int(location))
+        return positions
+
+    def build(self, root_name, texts):
+        """Build the element tree of one record.
+
+        Elements are created in mapping order the first time one of their
+        columns has a value, as the original row by row creator did.
+
+        Args:
+            root_name: tag of the root element
+            texts: text of each mapped column in mapping order, None if empty
+
+        Returns:
+
+        """
+        root = ET.Element(root_name)
+        elements = [None] * len(self.tags)
+        elements[0] = root
+        tags = self.tags
+        parents = self.parents
+        for (_, chains), text in zip(self.columns, texts):
+            if text is None:
+                continue
+            for chain in chains:
+                for node in chain:
+                    element = elements[node]
+                    if element is None:
+                        element = ET.SubElement(
+                            elements[parents[node]], tags[node]
+                        )
+                        elements[node] = element
+                element.text = text
+        return root
@@ -0,0 +1,320 @@
+""" Streaming readers for the AsphaltDB Excel workbooks
+"""
+from openpyxl import load_workbook
+from openpyxl.cell.cell import ERROR_CODES
+from openpyxl.utils import get_column_letter
+
+HEADER_DEPTH = 9
+
+# strings read as missing values by pandas.read_excel
+NA_VALUES = frozenset(
+    [
+        "",
+        "#N/A",
+        "#N/A N/A",
+        "#NA",
+        "-1.#IND",
+        "-1.#QNAN",
+        "-NaN",
+        "-nan",
+        "1.#IND",
+        "1.#QNAN",
+        "<NA>",
+        "N/A",
+        "NA",
+        "NULL",
+        "NaN",
+        "None",
+        "n/a",
+        "nan",
+        "null",
+    ]
+)
+
+
+def is_missing(value):
+    """Check if a cell value read by openpyxl is a missing value for pandas.
+
+    Args:
+        value:
+
+    Returns:
+
+    """
+    if value is None:
+        return True
+    return isinstance(value, str) and (
+        value in NA_VALUES or value in ERROR_CODES
+    )
+
+
+def convert_header_cell(value):
+    """Convert a header cell value as pandas.read_excel does.
+
+    Args:
+        value:
+
+    Returns:
+
+    """
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def convert_data_cell(value):
+    """Convert a data cell value as pandas.read_excel does.
+
+    Args:
+        value:
+
+    Returns:
+
+    """
+    if value is None:
+        return ""
+    if isinstance(value, str) and value in ERROR_CODES:
+        return float("nan")
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def convert_header_level(value):
+    """Convert a header level of a Rows sheet as pandas.read_excel does.
+
+    Args:
+        value:
+
+    Returns:
+        the value, NaN if missing
+
+    """
+    if is_missing(value):
+        return float("nan")
+    return convert_header_cell(value)
+
+
+def fill_mi_header(row, control_row):
+    """Forward fill blank entries in row but only inside the same parent index.
+
+    Same as the forward fill pandas.read_excel applies to MultiIndex headers.
+
+    Args:
+        row:
+        control_row:
+
+    Returns:
+
+    """
+    last = row[0]
+    for i in range(1, len(row)):
+        if not control_row[i]:
+            last = row[i]
+        if row[i] == "" or row[i] is None:
+            row[i] = last
+        else:
+            control_row[i] = False
+            last = row[i]
+    return row, control_row
+
+
+def build_header(header_rows):
+    """Build the column header tuples from the header rows.
+
+    Blank header cells are filled and named like in the MultiIndex columns
+    of pandas.read_excel, so that the mapping keys match.
+
+    Args:
+        header_rows: list of rows of header cell values
+
+    Returns:
+
+    """
+    rows = []
+    for row in header_rows:
+        row = [convert_header_cell(value) for value in row]
+        while row and row[-1] == "":
+            row.pop()
+        rows.append(row)
+    width = max(len(row) for row in rows)
+    control_row = [True] * width
+    levels = []
+    for level, row in enumerate(rows):
+        row, control_row = fill_mi_header(
+            row + [""] * (width - len(row)), control_row
+        )
+        levels.append(
+            [
+                value if value != "" else f"Unnamed: {i}_level_{level}"
+                for i, value in enumerate(row)
+            ]
+        )
+    return list(zip(*levels))
+
+
+def open_sheet(file, sheet_name):
+    """Open a workbook in read-only mode and return it with the named sheet.
+
+    Args:
+        file: path or file object of the workbook
+        sheet_name:
+
+    Returns:
+
+    """
+    workbook = load_workbook(
+        file, read_only=True, data_only=True, keep_links=False
+    )
+    if sheet_name not in workbook.sheetnames:
+        workbook.close()
+        raise ValueError(f"Worksheet named '{sheet_name}' not found")
+    sheet = workbook[sheet_name]
+    sheet.reset_dimensions()
+    return workbook, sheet
+
+
+class ColumnsSheetReader:
+    """Read the records of a 'Database (Columns)' sheet one row at a time.
+
+    The workbook is opened in read-only mode and rows are read as they are
+    iterated, so memory does not grow with the number of rows. Rows are
+    filtered as in process_excel: the example row following the first data
+    row is skipped, as well as rows with no value in the first column.
+    """
+
+    def __init__(self, file, sheet_name="Database (Columns)"):
+        """Open the workbook and read the header.
+
+        Args:
+            file: path or file object of the workbook
+            sheet_name:
+
+        """
+        self._workbook, sheet = open_sheet(file, sheet_name)
+        self._rows = sheet.iter_rows(values_only=True)
+        header_rows = [row for _, row in zip(range(HEADER_DEPTH), self._rows)]
+        if len(header_rows) < HEADER_DEPTH:
+            self.close()
+            raise ValueError(
+                f"header index {HEADER_DEPTH - 1} exceeds maximum index "
+                f"{len(header_rows) - 1} of data."
+            )
+        self.columns = build_header(header_rows)
+        self._first_column = next(
+            i for i, column in enumerate(self.columns) if "E" not in column
+        )
+
+    def __iter__(self):
+        """Yield the Excel row number and cell values of each record.
+
+        Returns:
+
+        """
+        for data_index, row in enumerate(self._rows):
+            if data_index == 1:
+                continue
+            if self._first_column >= len(row) or is_missing(
+                row[self._first_column]
+            ):
+                continue
+            yield HEADER_DEPTH + 1 + data_index, row
+
+    def read_columns(self, positions):
+        """Read all data rows, keeping only the cells at the given positions.
+
+        Cells are converted and trailing empty rows trimmed as in
+        pandas.read_excel, so that the rows can be parsed by
+        pandas.io.parsers.TextParser with the same type inference.
+
+        Args:
+            positions: sorted column positions to keep
+
+        Returns:
+            list of data rows, including the rows filtered when iterating
+
+        """
+        rows = []
+        last_row_with_data = -1
+        for row_number, row in enumerate(self._rows):
+            width = len(row)
+            rows.append(
+                [
+                    convert_data_cell(row[i]) if i < width else ""
+                    for i in positions
+                ]
+            )
+            if any(value is not None and value != "" for value in row):
+                last_row_with_data = row_number
+        return rows[: last_row_with_data + 1]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Close the workbook.
+
+        Returns:
+
+        """
+        self._workbook.close()
+
+
+class RowsSheetReader:
+    """Read the records of a 'Database (Rows)' sheet column by column.
+
+    The first 9 columns of each sheet row hold the header levels of a field
+    and each following column holds a record. Rows are read once, in
+    read-only mode, and their values stored column by column, so records
+    are built without a DataFrame or a transpose. Fields and records are
+    filtered as in process_excel_R: fields need at least two header levels,
+    the example column following the first record column is skipped, as
+    well as records with no value for the first field.
+    """
+
+    def __init__(self, file, sheet_name="Database (Rows)"):
+        """Read the sheet.
+
+        Args:
+            file: path or file object of the workbook
+            sheet_name:
+
+        """
+        workbook, sheet = open_sheet(file, sheet_name)
+        try:
+            self.columns = []
+            self._records = []
+            for row in sheet.iter_rows(values_only=True):
+                levels = tuple(
+                    convert_header_level(value) for value in row[:HEADER_DEPTH]
+                )
+                levels += (float("nan"),) * (HEADER_DEPTH - len(levels))
+                # NaN levels are the only ones not equal to themselves
+                if sum(level == level for level in levels) < 2:
+                    continue
+                values = row[HEADER_DEPTH:]
+                for index, value in enumerate(values):
+                    if index == len(self._records):
+                        self._records.append([None] * len(self.columns))
+                    self._records[index].append(value)
+                for record in self._records[len(values) :]:
+                    record.append(None)
+                self.columns.append(levels)
+        finally:
+            workbook.close()
+
+    def __iter__(self):
+        """Yield the Excel column letter and field values of each record.
+
+        Returns:
+
+        """
+        for index, record in enumerate(self._records):
+            if index == 1 or not record or is_missing(record[0]):
+                continue
+            yield get_column_letter(HEADER_DEPTH + index + 1), record
@@ -0,0 +1,74 @@
+""" Process-wide registries of objects built from files
+"""
+import os
+import threading
+
+
+class FileRegistry:
+    """Thread-safe registry building each file at most once per process.
+
+    Entries are keyed by absolute path and modification time: an object is
+    rebuilt only when the file it was built from changes on disk. An object
+    can also be built from several files, and is rebuilt when one changes.
+    """
+
+    def __init__(self, loader):
+        """Initialize the registry.
+
+        Args:
+            loader: callable building the object from a file path
+
+        """
+        self._loader = loader
+        self._entries = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def get(self, *paths):
+        """Return the object built from the files, building it if needed.
+
+        Args:
+            *paths: paths of the files, passed to the loader
+
+        Returns:
+
+        """
+        paths = tuple(os.path.abspath(path) for path in paths)
+        mtimes = tuple(os.stat(path).st_mtime_ns for path in paths)
+        entry = self._entries.get(paths)
+        if entry is not None and entry[0] == mtimes:
+            return entry[1]
+
+        with self._lock:
+            path_lock = self._locks.setdefault(paths, threading.Lock())
+        # build outside the registry lock so other files are not blocked
+        with path_lock:
+            entry = self._entries.get(paths)
+            if entry is None or entry[0] != mtimes:
+                entry = (mtimes, self._loader(*paths))
+                self._entries[paths] = entry
+        return entry[1]
+
+    def is_loaded(self, *paths):
+        """Check if an up-to-date object is registered for the files.
+
+        Args:
+            *paths:
+
+        Returns:
+
+        """
+        paths = tuple(os.path.abspath(path) for path in paths)
+        entry = self._entries.get(paths)
+        return entry is not None and entry[0] == tuple(
+            os.stat(path).st_mtime_ns for path in paths
+        )
+
+    def clear(self):
+        """Remove all registered objects.
+
+        Returns:
+
+        """
+        with self._lock:
+            self._entries.clear()
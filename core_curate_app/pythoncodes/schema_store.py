@@ -0,0 +1,172 @@
+""" Merge of XML schemas sharing global definitions
+"""
+import copy
+
+from lxml import etree
+
+# attributes of schema components referencing a global definition by name,
+# with the symbol space of the definition (None: same as the component)
+REFERENCE_ATTRIBUTES = {
+    "type": "type",
+    "base": "type",
+    "itemType": "type",
+    "memberTypes": "type",
+    "ref": None,
+    "substitutionGroup": "element",
+}
+
+
+def symbol_space(definition):
+    """Return the symbol space of a global definition, simple and complex
+    types sharing the same one.
+
+    Args:
+        definition: global definition element of a schema
+
+    Returns:
+
+    """
+    space = etree.QName(definition).localname
+    return "type" if space in ("simpleType", "complexType") else space
+
+
+def iter_references(definition):
+    """Yield the references to global definitions made in a definition.
+
+    Args:
+        definition: global definition element of a schema
+
+    Returns:
+        element, attribute, index of the name in the attribute value,
+        symbol space and name of each reference
+
+    """
+    for element in definition.iter(etree.Element):
+        for attribute, space in REFERENCE_ATTRIBUTES.items():
+            value = element.get(attribute)
+            if value is None:
+                continue
+            if space is None:
+                space = symbol_space(element)
+            for index, name in enumerate(value.split()):
+                yield element, attribute, index, space, name
+
+
+def merge_schemas(schemas):
+    """Merge schemas without target namespace into a single schema, where
+    definitions shared by several schemas are only defined once.
+
+    Two definitions are shared when they are written the same way and the
+    definitions they reference are shared as well. Other definitions named
+    like a definition of another schema are renamed, with their references.
+    A global element of a schema is validated by the merged schema as by
+    the schema itself.
+
+    Args:
+        schemas: list of xsd:schema elements, with the same attributes
+
+    Returns:
+        xsd:schema element of the merged schema
+
+    """
+    for schema in schemas[1:]:
+        if dict(schema.attrib) != dict(schemas[0].attrib):
+            raise ValueError(
+                "Schemas with different attributes can't be merged"
+            )
+
+    definitions = []
+    owners = []
+    lookups = []
+    for schema in schemas:
+        lookup = {}
+        for definition in schema.iterchildren(etree.Element):
+            if etree.QName(definition).localname in ("annotation", "notation"):
+                continue
+            if definition.get("name") is None:
+                raise ValueError(
+                    f"{etree.QName(definition).localname} can't be merged"
+                )
+            lookup[(symbol_space(definition), definition.get("name"))] = len(
+                definitions
+            )
+            definitions.append(definition)
+            owners.append(len(lookups))
+        lookups.append(lookup)
+    references = [
+        [
+            lookups[owners[position]].get((space, name))
+            for _, _, _, space, name in iter_references(definition)
+        ]
+        for position, definition in enumerate(definitions)
+    ]
+
+    # refine the groups of identical definitions until the definitions of a
+    # group reference the same groups
+    texts = {}
+    groups = [
+        texts.setdefault(
+            etree.tostring(definition, with_tail=False), len(texts)
+        )
+        for definition in definitions
+    ]
+    while True:
+        signatures = {}
+        refined = [
+            signatures.setdefault(
+                (
+                    groups[position],
+                    tuple(
+                        None if reference is None else groups[reference]
+                        for reference in references[position]
+                    ),
+                ),
+                len(signatures),
+            )
+            for position in range(len(definitions))
+        ]
+        if len(signatures) == len(texts):
+            break
+        texts = signatures
+        groups = refined
+
+    # name the groups, renaming the groups named like a previous one
+    reserved = {
+        (symbol_space(definition), definition.get("name"))
+        for definition in definitions
+    }
+    used = set()
+    names = {}
+    representatives = []
+    for position, definition in enumerate(definitions):
+        if groups[position] in names:
+            continue
+        space = symbol_space(definition)
+        name = definition.get("name")
+        suffix = 1
+        while (space, name) in used or (
+            suffix > 1 and (space, name) in reserved
+        ):
+            suffix += 1
+            name = f"{definition.get('name')}_{suffix}"
+        used.add((space, name))
+        names[groups[position]] = name
+        representatives.append(position)
+
+    merged = etree.Element(
+        schemas[0].tag, schemas[0].attrib, nsmap=schemas[0].nsmap
+    )
+    for position in representatives:
+        definition = copy.deepcopy(definitions[position])
+        definition.set("name", names[groups[position]])
+        lookup = lookups[owners[position]]
+        for element, attribute, index, space, name in iter_references(
+            definition
+        ):
+            reference = lookup.get((space, name))
+            if reference is not None:
+                tokens = element.get(attribute).split()
+                tokens[index] = names[groups[reference]]
+                element.set(attribute, " ".join(tokens))
+        merged.append(definition)
+    return merged
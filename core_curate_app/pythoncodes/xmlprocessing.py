@@ -1,13 +1,30 @@
 import os
+import re
 os.environ["OMP_NUM_THREADS"] = "1"
+import numpy as np
 import pandas as pd
 import xmlschema
-import re
 import xml.etree.ElementTree as ET
 from lxml import etree
+from openpyxl.utils import get_column_letter
 from datetime import datetime
 import pickle
+import hashlib
 import gc
+import multiprocessing
+import threading
+from bisect import bisect_left
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from types import MappingProxyType
+from pandas.io.parsers import TextParser
+
+from core_curate_app.pythoncodes.cache import PickleCache
+from core_curate_app.pythoncodes.mapping import MappingPlan
+from core_curate_app.pythoncodes.reader import HEADER_DEPTH, ColumnsSheetReader, RowsSheetReader, is_missing
+from core_curate_app.pythoncodes.registry import FileRegistry
+from core_curate_app.pythoncodes.schema_store import merge_schemas
 
 def process_excel(file, sheet_name: str = 'Database (Columns)') -> pd.DataFrame:
     df = pd.read_excel(file, sheet_name=sheet_name, header=[0,1,2,3,4,5,6,7,8])
@@ -17,6 +34,23 @@ def process_excel(file, sheet_name: str = 'Database (Columns)') -> pd.DataFrame:
     df = df.drop(index=1, errors='ignore')
     return df
 
+def process_excel_mapped(file, plan, sheet_name: str = 'Database (Columns)') -> pd.DataFrame:
+    """Same as process_excel, but only keeping the first column and the columns used by the mapping plan.
+
+    The sheet is read once and only the kept cells are converted and type inferred by pandas.
+    """
+    with ColumnsSheetReader(file, sheet_name) as reader:
+        header = reader.columns
+        mapped_columns = {column for column, _ in plan.columns}
+        first_column = next(i for i, column in enumerate(header) if 'E' not in column)
+        usecols = [i for i, column in enumerate(header) if i == first_column or column in mapped_columns]
+        rows = reader.read_columns(usecols)
+    df = TextParser(rows, header=None, skip_blank_lines=False).read()
+    df.columns = pd.MultiIndex.from_tuples([header[i] for i in usecols])
+    df = df[df.iloc[:, 0].notna()]
+    df = df.drop(index=1, errors='ignore')
+    return df
+
 def process_excel_R(file_path: str, sheet_name: str = 'Database (Rows)') -> pd.DataFrame:
     df = pd.read_excel(file_path, sheet_name=sheet_name, header=None)
     df = df.T
@@ -29,38 +63,167 @@ def process_excel_R(file_path: str, sheet_name: str = 'Database (Rows)') -> pd.D
     df = df[df.iloc[:, 0].notna()]
     return df
 
-def load_dict():
-    file_path = os.path.join(os.path.dirname(__file__), 'AM_excel_mapping.pkl')
+def load_mapping_file(file_path):
+    """Unpickle a mapping file into a read-only mapping of column to tuple of paths."""
     with open(file_path, "rb") as f:
         data = pickle.load(f)
-    return data
+    return MappingProxyType({column: tuple(paths) for column, paths in data.items()})
+
+mapping_registry = FileRegistry(load_mapping_file)
+
+mapping_plan_registry = FileRegistry(lambda file_path: MappingPlan(mapping_registry.get(file_path)))
+
+def get_mapping(file_name):
+    """Return the read-only mapping of a mapping file, loading it on first use."""
+    return mapping_registry.get(os.path.join(os.path.dirname(__file__), file_name))
+
+def get_mapping_plan(file_name):
+    """Return the compiled plan of a mapping file, compiling it on first use."""
+    return mapping_plan_registry.get(os.path.join(os.path.dirname(__file__), file_name))
+
+def load_file_digest(*file_paths):
+    """Return the SHA-256 digest of the content of one or more files."""
+    digest = hashlib.sha256()
+    for file_path in file_paths:
+        with open(file_path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+mapping_version_registry = FileRegistry(load_file_digest)
+
+def get_mapping_version(file_name):
+    """Return the version of a mapping file, the digest of its content."""
+    return mapping_version_registry.get(os.path.join(os.path.dirname(__file__), file_name))
+
+# to change when the same workbook and mapping give different documents or errors
+EXTRACTION_VERSION = 2
+
+def extraction_version(ExcelType, streaming=False):
+    """Return the version of the extraction of a sheet layout, from the reader and the version of the mapping."""
+    mapping_file = 'AM_excel_mapping_R.pkl' if ExcelType == "R" else 'AM_excel_mapping.pkl'
+    mapping_version = get_mapping_version(mapping_file)[:16]
+    reader = "streaming" if streaming else "dataframe"
+    return f"{EXTRACTION_VERSION}:{ExcelType}:{reader}:{mapping_version}"
+
+def extraction_cache_key(content, ExcelType, streaming=False):
+    """Return the cache key of the documents extracted from the bytes of a workbook.
+
+    The key depends on the workbook content, the sheet layout, the reader and the version of the mapping.
+    """
+    digest = hashlib.sha256(content).hexdigest()
+    return f"curate_excel:{extraction_version(ExcelType, streaming)}:{digest}"
+
+def load_dict():
+    return get_mapping('AM_excel_mapping.pkl')
 
 def load_dict_R():
-    file_path = os.path.join(os.path.dirname(__file__), 'AM_excel_mapping_R.pkl')
-    with open(file_path, "rb") as f:
-        data = pickle.load(f)
-    return data
+    return get_mapping('AM_excel_mapping_R.pkl')
 
-def load_test_schemas():
+# Excel type of the records of each sheet layout of the workbooks
+SHEET_EXCEL_TYPES = {"Rows": "R", "Columns": "C"}
+
+TESTS = {
+    "RuttingTestResults": "RuttingExp",
+    "MarshallTestResults": "MarshallExp",
+    "ITSTestResults": "ITSExp",
+    "TSRSTestResults": "TSRSTExp",
+    "UTSTestResults": "UTSTExp",
+    "StiffnessTestResults": "StiffnessExp"
+}
+
+TEST_SCHEMA_FILES = {
+    "RuttingExp": 'AsphaltDB-Rutting.xsd',
+    "MarshallExp": 'AsphaltDB-Marshall.xsd',
+    "ITSExp": 'AsphaltDB-ITS.xsd',
+    "TSRSTExp": 'AsphaltDB-TSRST.xsd',
+    "UTSTExp": 'AsphaltDB-UTST.xsd',
+    "StiffnessExp": 'AsphaltDB-Stiffness.xsd'
+}
+
+schema_disk_cache = None
+
+def configure_schema_disk_cache(directory):
+    """Store the schemas compiled with xmlschema in a directory shared by all server processes (None disables it)."""
+    global schema_disk_cache
+    schema_disk_cache = PickleCache(directory, f"xmlschema-{xmlschema.__version__}") if directory else None
+
+def compile_xmlschema(source, content):
+    """Compile a schema with xmlschema, or load it from the disk cache if one was compiled from the same content."""
+    if schema_disk_cache is None:
+        return xmlschema.XMLSchema(source)
+    return schema_disk_cache.get(content, lambda: xmlschema.XMLSchema(source))
+
+def get_test_schema_paths():
+    """Return the paths of the AsphaltDB schema files."""
     script_dir = os.path.dirname(__file__)
-    Tests = {
-        "RuttingTestResults": "RuttingExp",
-        "MarshallTestResults": "MarshallExp",
-        "ITSTestResults": "ITSExp",
-        "TSRSTestResults": "TSRSTExp",
-        "UTSTestResults": "UTSTExp",
-        "StiffnessTestResults": "StiffnessExp"
-    }
-    Schemas = {
-        "RuttingExp": xmlschema.XMLSchema(os.path.join(script_dir, 'AsphaltDB-Rutting.xsd')),
-        "MarshallExp": xmlschema.XMLSchema(os.path.join(script_dir, 'AsphaltDB-Marshall.xsd')),
-        "ITSExp": xmlschema.XMLSchema(os.path.join(script_dir, 'AsphaltDB-ITS.xsd')),
-        "TSRSTExp": xmlschema.XMLSchema(os.path.join(script_dir, 'AsphaltDB-TSRST.xsd')),
-        "UTSTExp": xmlschema.XMLSchema(os.path.join(script_dir, 'AsphaltDB-UTST.xsd')),
-        "StiffnessExp": xmlschema.XMLSchema(os.path.join(script_dir, 'AsphaltDB-Stiffness.xsd'))
-    }
-    return Tests, Schemas
-    
+    return [os.path.join(script_dir, file_name) for file_name in TEST_SCHEMA_FILES.values()]
+
+def merge_schema_files(*file_paths):
+    """Merge schema files into one schema defining their common definitions once, and return its content."""
+    merged = merge_schemas([etree.parse(file_path).getroot() for file_path in file_paths])
+    return etree.tostring(merged, encoding="unicode")
+
+merged_schema_registry = FileRegistry(merge_schema_files)
+test_schema_version_registry = FileRegistry(load_file_digest)
+
+def get_test_schema_version():
+    """Return the version of the AsphaltDB schema files, the digest of their contents."""
+    return test_schema_version_registry.get(*get_test_schema_paths())
+
+def load_test_schema(*file_paths):
+    """Compile the merged AsphaltDB schema files, through the disk cache if configured."""
+    content = merged_schema_registry.get(*file_paths)
+    return compile_xmlschema(content, content)
+
+schema_registry = FileRegistry(load_test_schema)
+
+def get_test_schema(root_name):
+    """Return the compiled AsphaltDB schema for a record root, compiling it on first use.
+
+    All tests share a schema merged from their schema files, so that their common definitions are only held once.
+    Its global elements are the test roots, each one validated as by the schema of its test.
+    """
+    if root_name not in TEST_SCHEMA_FILES:
+        raise KeyError(root_name)
+    return schema_registry.get(*get_test_schema_paths())
+
+def compile_fast_schema(xsd_tree):
+    """Compile a parsed XSD with lxml for fast validation, None if lxml cannot compile it."""
+    try:
+        return etree.XMLSchema(xsd_tree)
+    except (etree.XMLSchemaParseError, etree.XMLSyntaxError):
+        return None
+
+def compile_schemas(xsd_content):
+    """Compile XSD content with xmlschema, and with lxml for fast validation (None if lxml cannot compile it)."""
+    try:
+        xsd_tree = etree.fromstring(xsd_content.encode("utf-8"))
+    except etree.XMLSyntaxError:
+        fast_schema = None
+    else:
+        fast_schema = compile_fast_schema(xsd_tree)
+    return compile_xmlschema(xsd_content, xsd_content), fast_schema
+
+fast_schema_registry = FileRegistry(
+    lambda *file_paths: compile_fast_schema(etree.fromstring(merged_schema_registry.get(*file_paths).encode("utf-8")))
+)
+
+def get_test_fast_schema(root_name):
+    """Return the lxml compiled AsphaltDB schema for a record root, None if lxml cannot compile it."""
+    if root_name not in TEST_SCHEMA_FILES:
+        raise KeyError(root_name)
+    return fast_schema_registry.get(*get_test_schema_paths())
+
+def load_test_schemas():
+    Schemas = {root_name: get_test_schema(root_name) for root_name in TEST_SCHEMA_FILES}
+    return dict(TESTS), Schemas
+
+def warm_up_test_schemas():
+    """Compile all AsphaltDB schemas ahead of the first request."""
+    for root_name in TEST_SCHEMA_FILES:
+        get_test_fast_schema(root_name)
+        get_test_schema(root_name)
+
 def xml_creator(row, col_to_paths, root_name):
     root = ET.Element(root_name)
     for column, paths in col_to_paths.items():
@@ -114,6 +277,140 @@ def xml_creator_R(row, col_to_paths, root_name):
             child.text = str(column_value)
     return ET.tostring(root, encoding="unicode")
 
+def normalize_value(column_value, date_types=(pd.Timestamp,)):
+    """Return the text of a cell as written by xml_creator, None if empty."""
+    if pd.isna(column_value):
+        return None
+    return value_text(column_value, date_types)
+
+def value_text(column_value, date_types=(pd.Timestamp,)):
+    """Return the text of a non missing cell as written by xml_creator, None if empty."""
+    if column_value == '':
+        return None
+    if isinstance(column_value, float) and column_value.is_integer():
+        column_value = int(column_value)
+    if isinstance(column_value, date_types):
+        column_value = column_value.strftime("%Y-%m-%d")
+    return str(column_value)
+
+def normalize_value_R(column_value):
+    """Return the text of a cell as written by xml_creator_R, None if empty."""
+    return normalize_value(column_value, (pd.Timestamp, datetime))
+
+def normalize_cell(column_value):
+    """Return the text of a cell read by a streaming reader, None if empty."""
+    if is_missing(column_value):
+        return None
+    return normalize_value_R(column_value)
+
+def normalize_column(column, date_types=(pd.Timestamp,)):
+    """Return the text of each cell of a DataFrame column, as normalize_value does, converting whole typed columns at once."""
+    if isinstance(column.dtype, pd.StringDtype):
+        return [value or None for value in column.to_numpy(dtype=object, na_value=None)]
+    kind = column.dtype.kind
+    if kind in 'iub':
+        return column.to_numpy().astype(str).tolist()
+    if kind == 'M':
+        return column.dt.strftime("%Y-%m-%d").to_numpy(dtype=object, na_value=None).tolist()
+    if kind == 'f':
+        values = column.to_numpy()
+        texts = np.full(len(values), None, dtype=object)
+        # integers from 2**53 are not exactly converted to int64
+        integers = (np.abs(values) < 2 ** 53) & (values == np.trunc(values))
+        texts[integers] = values[integers].astype(np.int64).astype(str)
+        others = ~integers & ~np.isnan(values)
+        texts[others] = [normalize_value(value) for value in values[others].tolist()]
+        return texts.tolist()
+    values = column.to_numpy(dtype=object)
+    missing = pd.isna(values)
+    return [None if is_na else value_text(value, date_types) for value, is_na in zip(values, missing)]
+
+def iter_record_texts(df, plan, date_types=(pd.Timestamp,)):
+    """Yield the texts of the mapped columns of each DataFrame row, in mapping order.
+
+    Mapped columns are converted to their texts once, before the rows are yielded.
+    """
+    positions = plan.resolve(df.columns)
+    texts_by_position = {}
+    for pos in positions:
+        if pos is not None and pos not in texts_by_position:
+            texts_by_position[pos] = normalize_column(df.iloc[:, pos], date_types)
+    empty = [None] * len(df)
+    columns = [empty if pos is None else texts_by_position[pos] for pos in positions]
+    return zip(*columns) if columns else iter([()] * len(df))
+
+# compiled mapping plans unpickled by a worker process, by digest of their pickle
+_worker_plans = {}
+_WORKER_PLANS_SIZE = 4
+
+_extraction_pool = None
+_extraction_pool_workers = 0
+_extraction_pool_lock = threading.Lock()
+
+def get_extraction_pool(workers):
+    """Return the process pool shared by the extractions of the process, creating it on first use.
+
+    Workers are started by a fork server: forking the threads of a web server process could deadlock.
+    The pool is created again if the number of workers changes.
+    """
+    global _extraction_pool, _extraction_pool_workers
+    with _extraction_pool_lock:
+        if _extraction_pool is not None and _extraction_pool_workers != workers:
+            _extraction_pool.shutdown(wait=False)
+            _extraction_pool = None
+        if _extraction_pool is None:
+            _extraction_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("forkserver"))
+            _extraction_pool_workers = workers
+        return _extraction_pool
+
+def discard_extraction_pool(executor):
+    """Forget the shared process pool if it is still the given one, e.g. after one of its workers died."""
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is executor:
+            _extraction_pool = None
+    executor.shutdown(wait=False)
+
+def _load_worker_plan(plan_digest, plan_pickle):
+    """Return a compiled mapping plan in a worker process, only unpickling it the first time."""
+    plan = _worker_plans.get(plan_digest)
+    if plan is None:
+        if len(_worker_plans) >= _WORKER_PLANS_SIZE:
+            _worker_plans.clear()
+        plan = _worker_plans[plan_digest] = pickle.loads(plan_pickle)
+    return plan
+
+def _process_texts_chunk(plan_digest, plan_pickle, root_name, isolate_errors, chunk):
+    """Return the test documents of each record of a chunk, in a worker process."""
+    plan = _load_worker_plan(plan_digest, plan_pickle)
+    return [extract_record(plan, root_name, texts, isolate_errors) for texts in chunk]
+
+def process_records_parallel(texts_rows, plan, root_name, workers, chunk_size, isolate_errors=False):
+    """Yield the test documents of each record, built and split in the shared process pool.
+
+    Records are sent to the workers in chunks of chunk_size rows of texts and the results are
+    yielded in row order. With isolate_errors, failed records are yielded as RecordError.
+    """
+    texts_rows = list(texts_rows)
+    chunks = [texts_rows[i:i + chunk_size] for i in range(0, len(texts_rows), chunk_size)]
+    if not chunks:
+        return
+    plan_pickle = pickle.dumps(plan, protocol=pickle.HIGHEST_PROTOCOL)
+    plan_digest = hashlib.sha256(plan_pickle).hexdigest()
+    executor = get_extraction_pool(workers)
+    try:
+        for chunk in executor.map(partial(_process_texts_chunk, plan_digest, plan_pickle, root_name, isolate_errors), chunks):
+            yield from chunk
+    except BrokenProcessPool:
+        discard_extraction_pool(executor)
+        raise
+
+def track_progress(records, progress, rows_total=None):
+    """Yield the test documents of each record, reporting the number of records processed."""
+    for rows_processed, xmls in enumerate(records, 1):
+        progress("extracting", rows_processed, rows_total)
+        yield xmls
+
 def remove_nmbrd_tags(xml_string):
     root = ET.fromstring(xml_string)
     for elem in root.iter():
@@ -123,27 +420,9 @@ def remove_nmbrd_tags(xml_string):
     return ET.tostring(root, encoding="unicode")
 
 def seperate_semicolons(xml_s, elements):
-    for ele in elements:
-        pattern = rf'(<{ele}.*?>)(.*?)(</{ele}>)'
-        matches = re.findall(pattern, xml_s, re.DOTALL)
-        for match in matches:
-            opening, content, closing = match
-            child_ele = re.findall(r'<(.*?)>(.*?)</\1>', content)
-            split_val = {child[0]: child[1].split(';') for child in child_ele if ';' in child[1]}
-            valid_values = [values for values in split_val.values() if values]
-            if valid_values:
-                num_ele = min(len(values) for values in valid_values)
-            else:
-                continue
-            new_eles = []
-            for i in range(num_ele):
-                new_ele = f'<{ele}>'
-                for tag, values in split_val.items():
-                    new_ele += f'<{tag}>{values[i].strip()}</{tag}>'
-                new_ele += f'</{ele}>'
-                new_eles.append(new_ele)
-            xml_s = xml_s.replace(f'{opening}{content}{closing}', ''.join(new_eles), 1)
-    return xml_s
+    root = ET.fromstring(xml_s)
+    seperate_semicolons_tree(root, elements)
+    return ET.tostring(root, encoding="unicode")
 
 def keep_only_first_child(xml_string, parent_tags):
     root = ET.fromstring(xml_string)  
@@ -157,31 +436,207 @@ def keep_only_first_child(xml_string, parent_tags):
     return ET.tostring(root, encoding="unicode")
 
 def extract_single_xmls(Record, Tests):
-    extracted_xmls = []    
-    datasourcenode = re.search(r'<DataSource>(.*?)</DataSource>', Record, re.DOTALL)
-    mixturenode = re.search(r'<Mixture>(.*?)</Mixture>', Record, re.DOTALL)
-    datasource = datasourcenode.group(0) if datasourcenode else ''
-    mixture = mixturenode.group(0) if mixturenode else ''
+    return extract_single_xmls_tree(ET.fromstring(Record), Tests)
+
+SEMICOLON_ELEMENTS = ["Point", "AdditionalProperties", "OtherMixingProperty", "Case"]
+
+CHOICE_ELEMENTS = ["DataRecord", "CompleteDataRecord", "SamplePreparation", "Procedure", "SampleDimensions"]
+
+def remove_nmbrd_tags_tree(root):
+    """Tree version of remove_nmbrd_tags, also normalizing line endings as parsing would."""
+    for elem in root.iter():
+        if not elem.tag.startswith('SmallSize'):
+            elem.tag = elem.tag.split('_')[0]
+        if elem.text and '\r' in elem.text:
+            elem.text = elem.text.replace('\r\n', '\n').replace('\r', '\n')
+    return root
+
+def _semicolon_leaves(element, path=()):
+    for child in element:
+        child_path = path + (child.tag,)
+        if len(child):
+            yield from _semicolon_leaves(child, child_path)
+        elif child.text and ';' in child.text:
+            yield child_path, child.text
+
+def split_semicolon_element(element):
+    """Return one copy of the element per semicolon separated value of its leaves, None if it has none.
+
+    Each copy only holds the leaves with semicolon separated values, nested under copies of their
+    ancestors, and the number of copies is the length of the shortest list of values.
+    """
+    split_val = {path: text.split(';') for path, text in _semicolon_leaves(element)}
+    if not split_val:
+        return None
+    num_ele = min(len(values) for values in split_val.values())
+    new_eles = []
+    for i in range(num_ele):
+        new_ele = ET.Element(element.tag)
+        created = {(): new_ele}
+        for path, values in split_val.items():
+            for depth in range(1, len(path) + 1):
+                if path[:depth] not in created:
+                    created[path[:depth]] = ET.SubElement(created[path[:depth - 1]], path[depth - 1])
+            created[path].text = values[i].strip()
+        new_eles.append(new_ele)
+    return new_eles
+
+def seperate_semicolons_tree(root, elements):
+    """Replace each of the given elements holding semicolon separated values by one element per value.
+
+    The children of each parent are rebuilt at most once per element tag, so the cost is linear in
+    the size of the tree.
+    """
+    for ele in elements:
+        for parent in list(root.iter()):
+            new_children = []
+            replaced = False
+            for child in parent:
+                new_eles = split_semicolon_element(child) if child.tag == ele else None
+                if new_eles is None:
+                    new_children.append(child)
+                else:
+                    new_children.extend(new_eles)
+                    replaced = True
+            if replaced:
+                parent[:] = new_children
+    return root
+
+def keep_only_first_child_tree(root, parent_tags):
+    """Tree version of keep_only_first_child."""
+    for parent_tag in parent_tags:
+        for parent in root.findall(f".//{parent_tag}"):
+            children = list(parent)
+            if len(children) > 1:
+                first_child = children[0]
+                parent.clear()
+                parent.append(first_child)
+    return root
+
+def index_record(root, Tests):
+    """Index a record tree in one pass.
+
+    Returns the first DataSource and Mixture nodes, the document positions and nodes of each test
+    results node, and the document positions and nodes of the Notes nodes.
+    """
+    datasourcenode = None
+    mixturenode = None
+    results_nodes = {node: [] for node in Tests}
+    notes_positions = []
+    notes_nodes = []
+    for position, elem in enumerate(root.iter()):
+        tag = elem.tag
+        if tag == 'Notes':
+            notes_positions.append(position)
+            notes_nodes.append(elem)
+        elif tag in results_nodes:
+            results_nodes[tag].append((position, elem))
+        elif tag == 'DataSource' and datasourcenode is None:
+            datasourcenode = elem
+        elif tag == 'Mixture' and mixturenode is None:
+            mixturenode = elem
+    return datasourcenode, mixturenode, results_nodes, notes_positions, notes_nodes
+
+def extract_single_xmls_tree(root, Tests):
+    """Build one document per test results node of a record, with the Notes following it.
+
+    The DataSource and Mixture nodes shared by all the documents are serialized once.
+    """
+    extracted_xmls = []
+    datasourcenode, mixturenode, results_nodes, notes_positions, notes_nodes = index_record(root, Tests)
+    datasource = ET.tostring(datasourcenode, encoding="unicode") if datasourcenode is not None else ''
+    mixture = ET.tostring(mixturenode, encoding="unicode") if mixturenode is not None else ''
+    notes_xmls = {}
     for node, new_root in Tests.items():
-        pattern = fr'<({node})>(.*?)</\1>'
-        matches = re.finditer(pattern, Record, re.DOTALL)        
-        for match in matches:
-            results = match.group(0)            
-            notesnode = re.search(r'<Notes>(.*?)</Notes>', Record[match.end():], re.DOTALL)
-            notes = notesnode.group(0) if notesnode else ''
-            new_xml = f'<{new_root}>{datasource}{mixture}{results}{notes}</{new_root}>'      
-            extracted_xmls.append(new_xml)
+        for position, results_node in results_nodes[node]:
+            results = ET.tostring(results_node, encoding="unicode")
+            end = position + sum(1 for _ in results_node.iter())
+            notes_index = bisect_left(notes_positions, end)
+            if notes_index < len(notes_nodes):
+                if notes_index not in notes_xmls:
+                    notes_xmls[notes_index] = ET.tostring(notes_nodes[notes_index], encoding="unicode")
+                notes = notes_xmls[notes_index]
+            else:
+                notes = ''
+            extracted_xmls.append(f'<{new_root}>{datasource}{mixture}{results}{notes}</{new_root}>')
     return extracted_xmls
 
+def process_record(root, Tests=TESTS):
+    """Run all processing stages on the element tree of one record and return its test documents."""
+    remove_nmbrd_tags_tree(root)
+    seperate_semicolons_tree(root, SEMICOLON_ELEMENTS)
+    keep_only_first_child_tree(root, CHOICE_ELEMENTS)
+    return extract_single_xmls_tree(root, Tests)
+
+# characters not allowed in XML 1.0 documents, written as is by ElementTree
+INVALID_XML_CHARACTER = re.compile('[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]')
+
+class RecordError(Exception):
+    """Failure of a stage of the extraction of one record."""
+
+    def __init__(self, stage, message):
+        super().__init__(stage, message)
+        self.stage = stage
+        self.message = message
+
+def check_xml_characters(xml_strings):
+    """Raise ValueError if a document holds a character not allowed in XML, naming its element."""
+    for xml_string in xml_strings:
+        match = INVALID_XML_CHARACTER.search(xml_string)
+        if match:
+            start = xml_string.rfind('<', 0, match.start()) + 1
+            tag = xml_string[start:xml_string.index('>', start)]
+            raise ValueError(f"Invalid XML character U+{ord(match.group()):04X} in element '{tag}'")
+
+def extract_record(plan, root_name, texts, isolate_errors=False):
+    """Build the element tree of one record from its texts and return its test documents.
+
+    With isolate_errors, a failure is returned as a RecordError naming the stage that failed instead of being raised.
+    """
+    stage = "building"
+    try:
+        root = plan.build(root_name, texts)
+        stage = "processing"
+        xmls = process_record(root)
+        stage = "serializing"
+        check_xml_characters(xmls)
+        return xmls
+    except Exception as e:
+        if not isolate_errors:
+            raise
+        return RecordError(stage, str(e))
+
+def record_location(ExcelType, index):
+    """Return the Excel coordinate of the record at a data index: its row in a Columns sheet, its column in a Rows sheet."""
+    if ExcelType == "R":
+        return {"column": get_column_letter(HEADER_DEPTH + index + 1)}
+    return {"row": HEADER_DEPTH + 1 + index}
+
+def collect_record_error(xmls, location, errors):
+    """Return the test documents of a record, or none after adding its error with its location to errors."""
+    if isinstance(xmls, RecordError):
+        errors.append(dict(location, stage=xmls.stage, error=xmls.message))
+        return []
+    return xmls
+
+# tag of the root element of a test document, which starts with its start tag
+ROOT_TAG = re.compile(r'<([^\s/>]+)')
+
 def add_names(nested_list, ExcelType):
-    file_dict = {}  
+    if ExcelType not in ("C", "R"):
+        return "ExcelType is not correctly defined, only 'R' and 'C' are allowed"
+    file_dict = dict(iter_names(nested_list, ExcelType))
+    return file_dict
+
+def iter_names(nested_list, ExcelType):
+    """Yield the file name and XML document of each test document of each record, as add_names names them."""
     start_id = 12
     if ExcelType == "C":
         Idn = "Row"
     elif ExcelType == "R":
         Idn = "Column"
     else:
-        return "ExcelType is not correctly defined, only 'R' and 'C' are allowed"
+        raise ValueError("ExcelType is not correctly defined, only 'R' and 'C' are allowed")
     
     def get_column_letter(num):
         letter = ''
@@ -192,43 +647,182 @@ def add_names(nested_list, ExcelType):
     
     for i, sublist in enumerate(nested_list):
         for j, item in enumerate(sublist):
-            root = etree.XML(item).tag
+            root = ROOT_TAG.match(item).group(1)
             if ExcelType == "C":
                 file_name = f"{Idn} {start_id + i } - {root.rstrip('Exp')}"
             elif ExcelType == "R":
                 column_letter = get_column_letter(start_id + i )
                 file_name = f"{Idn} '{column_letter}' - {root.rstrip('Exp')}"
-            file_dict[file_name] = item  
-    return file_dict
+            yield file_name, item
     
-def process_xml_final(excel):
-    df = process_excel(excel)
-    dic=load_dict()
-    Tests, Schemas = load_test_schemas()
-    xml_0 = [xml_creator(row, dic, "AsphaltMine") for _, row in df.iterrows()]
-    xml_1 = [remove_nmbrd_tags(xml) for xml in xml_0]
-    semicolons = ["Point", "AdditionalProperties", "OtherMixingProperty", "Case"]
-    xml_2 = [seperate_semicolons(xml_string, semicolons) for xml_string in xml_1] 
-    choice = ["DataRecord", "CompleteDataRecord", "SamplePreparation", "Procedure","SampleDimensions"]
-    xml_3 = [keep_only_first_child(xml_string, choice) for xml_string in xml_2]
-    xml_4 = [extract_single_xmls(xml, Tests) for xml in xml_3]
+def iter_located_texts_streaming(excel, plan):
+    """Yield the Excel row and the mapped texts of each record of a Columns workbook, reading one row at a time."""
+    with ColumnsSheetReader(excel) as reader:
+        positions = plan.resolve(pd.MultiIndex.from_tuples(reader.columns))
+        for row_number, row in reader:
+            yield {"row": row_number}, [None if pos is None or pos >= len(row) else normalize_cell(row[pos]) for pos in positions]
+
+def iter_located_texts_streaming_R(excel, plan):
+    """Yield the Excel column and the mapped texts of each record of a Rows workbook, walking the sheet column by column."""
+    reader = RowsSheetReader(excel)
+    positions = plan.resolve(pd.MultiIndex.from_tuples(reader.columns))
+    for column_letter, record in reader:
+        yield {"column": column_letter}, [None if pos is None else normalize_cell(record[pos]) for pos in positions]
+
+def iter_xml_records_streaming(excel, errors=None):
+    """Yield the test documents of each record of a Columns workbook, reading one row at a time.
+
+    Cells are converted one by one instead of by column: dates are always written as dates and
+    strings are never parsed as numbers. With an errors list, failed records are added to it and yield no document.
+    """
+    plan = get_mapping_plan('AM_excel_mapping.pkl')
+    for location, texts in iter_located_texts_streaming(excel, plan):
+        xmls = extract_record(plan, "AsphaltMine", texts, errors is not None)
+        yield xmls if errors is None else collect_record_error(xmls, location, errors)
+
+def iter_xml_records_streaming_R(excel, errors=None):
+    """Yield the test documents of each record of a Rows workbook, walking the sheet column by column."""
+    plan = get_mapping_plan('AM_excel_mapping_R.pkl')
+    for location, texts in iter_located_texts_streaming_R(excel, plan):
+        xmls = extract_record(plan, "AsphaltMine", texts, errors is not None)
+        yield xmls if errors is None else collect_record_error(xmls, location, errors)
+
+def extract_records(df, plan, date_types, workers, chunk_size, errors, ExcelType):
+    """Yield the test documents of each DataFrame row, in a process pool if workers > 1.
+
+    With an errors list, failed records yield no document and are added to it with their Excel coordinate.
+    """
+    texts_rows = iter_record_texts(df, plan, date_types)
+    isolate_errors = errors is not None
+    if workers > 1:
+        xml_4 = process_records_parallel(texts_rows, plan, "AsphaltMine", workers, chunk_size, isolate_errors)
+    else:
+        xml_4 = (extract_record(plan, "AsphaltMine", texts, isolate_errors) for texts in texts_rows)
+    if not isolate_errors:
+        return xml_4
+    return (collect_record_error(xmls, record_location(ExcelType, index), errors) for index, xmls in zip(df.index, xml_4))
+
+def iter_xml_records(excel, streaming=False, workers=0, chunk_size=50, progress=None, errors=None):
+    """Yield the test documents of each record of a Columns workbook, as they are extracted.
+
+    With an errors list, a record that fails does not stop the extraction: it yields no document and its
+    Excel row, failed stage and error message are added to the list.
+    """
+    if progress is not None:
+        progress("reading")
+    if streaming:
+        xml_4 = iter_xml_records_streaming(excel, errors)
+        rows_total = None
+    else:
+        plan = get_mapping_plan('AM_excel_mapping.pkl')
+        df = process_excel_mapped(excel, plan)
+        rows_total = len(df)
+        xml_4 = extract_records(df, plan, (pd.Timestamp,), workers, chunk_size, errors, "C")
+    if progress is not None:
+        xml_4 = track_progress(xml_4, progress, rows_total)
+    yield from xml_4
+
+def iter_xml_records_R(excel, streaming=False, workers=0, chunk_size=50, progress=None, errors=None):
+    """Yield the test documents of each record of a Rows workbook, as they are extracted, as iter_xml_records does."""
+    if progress is not None:
+        progress("reading")
+    if streaming:
+        xml_4 = iter_xml_records_streaming_R(excel, errors)
+        rows_total = None
+    else:
+        df = process_excel_R(excel)
+        plan = get_mapping_plan('AM_excel_mapping_R.pkl')
+        rows_total = len(df)
+        xml_4 = extract_records(df, plan, (pd.Timestamp, datetime), workers, chunk_size, errors, "R")
+    if progress is not None:
+        xml_4 = track_progress(xml_4, progress, rows_total)
+    yield from xml_4
+
+def iter_xml_final(excel, ExcelType, **options):
+    """Yield the file name and XML document of each test document of a workbook, as they are extracted.
+
+    Options are the keyword arguments of process_xml_final.
+    """
+    if ExcelType == "R":
+        return iter_names(iter_xml_records_R(excel, **options), "R")
+    return iter_names(iter_xml_records(excel, **options), ExcelType)
+
+def process_xml_final(excel, streaming=False, workers=0, chunk_size=50, progress=None, errors=None):
+    xml_4 = iter_xml_records(excel, streaming, workers, chunk_size, progress, errors)
     xml_f = add_names(xml_4,"C")
     return xml_f
 
-def process_xml_final_R(excel):
-    df = process_excel_R(excel)
-    dic=load_dict_R()
-    Tests, Schemas = load_test_schemas()
-    xml_0 = [xml_creator_R(row, dic, "AsphaltMine") for _, row in df.iterrows()]
-    xml_1 = [remove_nmbrd_tags(xml) for xml in xml_0]
-    semicolons = ["Point", "AdditionalProperties", "OtherMixingProperty", "Case"]
-    xml_2 = [seperate_semicolons(xml_string, semicolons) for xml_string in xml_1] 
-    choice = ["DataRecord", "CompleteDataRecord", "SamplePreparation", "Procedure","SampleDimensions"]
-    xml_3 = [keep_only_first_child(xml_string, choice) for xml_string in xml_2]
-    xml_4 = [extract_single_xmls(xml, Tests) for xml in xml_3]
+def process_xml_final_R(excel, streaming=False, workers=0, chunk_size=50, progress=None, errors=None):
+    xml_4 = iter_xml_records_R(excel, streaming, workers, chunk_size, progress, errors)
     xml_f = add_names(xml_4,"R")
     return xml_f
 
+def read_located_texts(excel, ExcelType, streaming=False):
+    """Return the mapping plan of a sheet layout and an iterator of the Excel coordinate and mapped texts of each record."""
+    if ExcelType == "R":
+        plan = get_mapping_plan('AM_excel_mapping_R.pkl')
+        if streaming:
+            return plan, iter_located_texts_streaming_R(excel, plan)
+        df = process_excel_R(excel)
+        date_types = (pd.Timestamp, datetime)
+    else:
+        plan = get_mapping_plan('AM_excel_mapping.pkl')
+        if streaming:
+            return plan, iter_located_texts_streaming(excel, plan)
+        df = process_excel_mapped(excel, plan)
+        date_types = (pd.Timestamp,)
+    locations = (record_location(ExcelType, index) for index in df.index)
+    return plan, zip(locations, iter_record_texts(df, plan, date_types))
+
+def record_fingerprint(texts):
+    """Return the SHA-256 digest of the mapped texts of a record, the same for records extracted the same way."""
+    return hashlib.sha256(repr(tuple(texts)).encode("utf-8")).hexdigest()
+
+def extract_incremental(excel, ExcelType, previous=None, streaming=False, progress=None, errors=None):
+    """Return the named records of a workbook, only extracting the records whose texts changed since a previous extraction.
+
+    previous is the state returned by the previous extraction of the same workbook, or None. Records are matched by
+    the fingerprint of their mapped texts, so moved records are not extracted again. Returns the named records,
+    the names of the new, changed, removed and unchanged records, and the state of this extraction.
+    With an errors list, failed records are added to it as in iter_xml_records, otherwise their error is raised.
+    """
+    version = extraction_version(ExcelType, streaming)
+    if previous is None or previous["version"] != version:
+        previous = {"version": version, "rows": [], "documents": {}}
+    documents_before = previous["documents"]
+    records_before = dict(iter_names(
+        ([] if isinstance(documents_before[fingerprint], RecordError) else documents_before[fingerprint]
+         for fingerprint in previous["rows"]), ExcelType))
+
+    if progress is not None:
+        progress("reading")
+    plan, located_texts = read_located_texts(excel, ExcelType, streaming)
+    rows = []
+    documents = {}
+    xml_4 = []
+    for location, texts in located_texts:
+        fingerprint = record_fingerprint(texts)
+        xmls = documents.get(fingerprint)
+        if xmls is None:
+            xmls = documents_before.get(fingerprint)
+        if xmls is None:
+            xmls = extract_record(plan, "AsphaltMine", texts, True)
+        documents[fingerprint] = xmls
+        rows.append(fingerprint)
+        if isinstance(xmls, RecordError) and errors is None:
+            raise xmls
+        xml_4.append(xmls if errors is None else collect_record_error(xmls, location, errors))
+        if progress is not None:
+            progress("extracting", len(rows), None)
+
+    records = dict(iter_names(xml_4, ExcelType))
+    changes = {"new": [], "changed": [], "removed": [], "unchanged": []}
+    for name, xml in records.items():
+        xml_before = records_before.get(name)
+        changes["new" if xml_before is None else "unchanged" if xml_before == xml else "changed"].append(name)
+    changes["removed"] = [name for name in records_before if name not in records]
+    return records, changes, {"version": version, "rows": rows, "documents": documents}
+
 def validation_fix_path(path):
     parts = path.lstrip('/').split('/')
     if len(parts) >= 2:
@@ -241,9 +835,12 @@ def validation_fix_path(path):
         processed_parts = parts
     return ' → '.join(processed_parts)
 
-def validate_record(xml_str, schema):
+def validate_record(xml_str, schema, fast_schema=None):
     try:
         xml_tree = etree.fromstring(xml_str)
+        # valid records pass the lxml schema, xmlschema only runs to explain the errors
+        if fast_schema is not None and fast_schema.validate(xml_tree):
+            return "VALID"
         schema.validate(xml_tree)
         return "VALID"
     except xmlschema.XMLSchemaValidationError as e:
@@ -269,3 +866,20 @@ def validate_record(xml_str, schema):
         return f"INVALID: XML syntax error: {e.msg} at line {e.lineno}, column {e.offset}"
     except Exception as e:
         return f"INVALID: Unexpected error: {str(e)}"
+
+def validate_test_document(xml_str):
+    """Validate an extracted test document against the AsphaltDB schema of its root, as validate_record does.
+
+    The xmlschema schema of a test is only compiled once one of its documents fails the lxml schema.
+    """
+    try:
+        xml_tree = etree.fromstring(xml_str)
+    except etree.XMLSyntaxError as e:
+        return f"INVALID: XML syntax error: {e.msg} at line {e.lineno}, column {e.offset}"
+    root_name = xml_tree.tag
+    if root_name not in TEST_SCHEMA_FILES:
+        return f"INVALID: No schema for test document '{root_name}'"
+    fast_schema = get_test_fast_schema(root_name)
+    if fast_schema is not None and fast_schema.validate(xml_tree):
+        return "VALID"
+    return validate_record(xml_str, get_test_schema(root_name))
@@ -36,3 +36,97 @@ ENABLE_XML_ENTITIES_TOOLTIPS = getattr(
 """
 
 BOOTSTRAP_VERSION = getattr(settings, "BOOTSTRAP_VERSION", "5.1.3")
+
+CURATE_EXCEL_SCHEMAS_WARM_UP = getattr(
+    settings, "CURATE_EXCEL_SCHEMAS_WARM_UP", False
+)
+""" boolean: compile the AsphaltDB test schemas in the background when the app
+is ready, instead of on the first Excel upload.
+"""
+
+CURATE_EXCEL_STREAMING_READER = getattr(
+    settings, "CURATE_EXCEL_STREAMING_READER", False
+)
+""" boolean: read workbooks with the openpyxl readers in extractxml, instead of
+loading the whole sheet in a DataFrame: 'Columns' sheets one row at a time and
+'Rows' sheets column by column. Cells are then converted one by one: dates are
+always written as dates and text is never parsed as numbers.
+"""
+
+CURATE_EXCEL_EXTRACTION_WORKERS = getattr(
+    settings, "CURATE_EXCEL_EXTRACTION_WORKERS", 0
+)
+""" integer: number of worker processes building the XML documents of the
+records of a workbook in extractxml. With 0 or 1, records are built in the
+request process. The workers are started by a fork server on first use and
+shared by the requests of the server process. Not used with
+CURATE_EXCEL_STREAMING_READER.
+"""
+
+CURATE_EXCEL_EXTRACTION_CHUNK_SIZE = getattr(
+    settings, "CURATE_EXCEL_EXTRACTION_CHUNK_SIZE", 50
+)
+""" integer: number of records sent at once to an extraction worker process.
+"""
+
+CURATE_EXCEL_JOB_WORKERS = getattr(settings, "CURATE_EXCEL_JOB_WORKERS", 2)
+""" integer: number of extraction jobs run at the same time by each server
+process, for extractxml requests sent with async=true.
+"""
+
+CURATE_EXCEL_JOB_TTL = getattr(settings, "CURATE_EXCEL_JOB_TTL", 3600)
+""" integer: number of seconds the status and result of a finished extraction
+job can be retrieved.
+"""
+
+CURATE_EXCEL_JOB_CACHE = getattr(settings, "CURATE_EXCEL_JOB_CACHE", "default")
+""" string: alias of the Django cache keeping the status, progress and result
+of the extraction jobs. With several server processes, it must be a cache
+shared by them (e.g. Redis or database, not local memory), as a job can be
+polled by a process other than the one running it.
+"""
+
+CURATE_EXCEL_RESULT_CACHE = getattr(
+    settings, "CURATE_EXCEL_RESULT_CACHE", None
+)
+""" string: alias of the Django cache (from CACHES) keeping the records
+extracted from uploaded workbooks, so that uploading the same workbook again
+returns them without extraction. Entries are keyed by the SHA-256 digest of the
+workbook, the sheet layout and the mapping version. Size and eviction are
+those of the cache backend, e.g. a LocMemCache with a small MAX_ENTRIES, which
+evicts the least recently used entries. None disables the cache.
+"""
+
+CURATE_EXCEL_LINEAGE_CACHE = getattr(
+    settings, "CURATE_EXCEL_LINEAGE_CACHE", None
+)
+""" string: alias of the Django cache (from CACHES) keeping the fingerprints
+and documents of the records of the last workbook uploaded to extractxml by
+each user under each file name. Uploading a new version of the workbook then
+only extracts and validates its new and changed records, and the JSON response
+has a "changes" key, next to "records" and "errors", with the names of the new,
+changed, removed and unchanged records. Not used by NDJSON responses. None disables incremental extraction.
+"""
+
+CURATE_BATCH_VALIDATION_WORKERS = getattr(
+    settings, "CURATE_BATCH_VALIDATION_WORKERS", 0
+)
+""" integer: number of threads validating the records of a validaterecords
+request. With 0 or 1, records are validated one after the other.
+"""
+
+CURATE_SCHEMA_CACHE_SIZE = getattr(settings, "CURATE_SCHEMA_CACHE_SIZE", 32)
+""" integer: number of compiled template schemas kept by validaterecord and
+validaterecords, the least recently used being evicted first. Schemas are
+compiled again when the content of their template changes.
+"""
+
+CURATE_SCHEMA_DISK_CACHE_DIR = getattr(
+    settings, "CURATE_SCHEMA_DISK_CACHE_DIR", None
+)
+""" string: path of a directory where schemas compiled by xmlschema (template
+and AsphaltDB schemas) are stored, keyed by the SHA-256 digest of their
+content, so that new server processes load them instead of compiling them.
+The directory can be filled ahead of time with the compileschemas command and
+must only be writable by the server. None disables the cache.
+"""
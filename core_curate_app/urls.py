@@ -88,8 +88,28 @@ urlpatterns = [
     re_path(r"^save-form$", user_ajax.save_form, name="core_curate_save_form"),
     re_path(r"^save-data$", user_ajax.save_data, name="core_curate_save_data"),
     re_path(r'^save-xml-data/$', user_ajax.save_xml_data, name='core_curate_save_xml_data'),
+    re_path(
+        r"^save-xml-data/batch/$",
+        user_ajax.save_xml_data_batch,
+        name="core_curate_save_xml_data_batch",
+    ),
     re_path(r'^validate-record/$', user_ajax.validaterecord, name='core_curate_validate_record'),
+    re_path(
+        r"^validate-records/$",
+        user_ajax.validaterecords,
+        name="core_curate_validate_records",
+    ),
     re_path(r'^extractxml/$', user_ajax.extractxml, name='core_curate_extract_xml'),
+    re_path(
+        r"^extractxml/jobs/(?P<job_id>\w+)/$",
+        user_ajax.extractxml_job,
+        name="core_curate_extract_xml_job",
+    ),
+    re_path(
+        r"^ingestxml/$",
+        user_ajax.ingestxml,
+        name="core_curate_ingest_xml",
+    ),
     re_path(
         r"^validate-form$",
         user_ajax.validate_form,
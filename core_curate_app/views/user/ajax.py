@@ -1,9 +1,14 @@
 """AJAX views for the Curate app
 """
+import hashlib
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
 
 from django.contrib import messages
+from django.core.cache import caches
+from django.db import connection, transaction
 from django.http.response import HttpResponseBadRequest, HttpResponse
 from django.template import loader
 from django.urls import reverse
@@ -11,7 +16,7 @@ from django.utils.html import escape
 from lxml.etree import XMLSyntaxError
 import xmlschema
 from django.shortcuts import redirect
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 
 import core_curate_app.components.curate_data_structure.api as curate_data_structure_api
 import core_curate_app.views.user.forms as users_forms
@@ -21,6 +26,18 @@ from core_curate_app.components.curate_data_structure.models import (
     CurateDataStructure,
 )
 from core_curate_app.permissions import rights as rights
+from core_curate_app.settings import (
+    CURATE_BATCH_VALIDATION_WORKERS,
+    CURATE_EXCEL_EXTRACTION_CHUNK_SIZE,
+    CURATE_EXCEL_EXTRACTION_WORKERS,
+    CURATE_EXCEL_JOB_CACHE,
+    CURATE_EXCEL_JOB_TTL,
+    CURATE_EXCEL_JOB_WORKERS,
+    CURATE_EXCEL_LINEAGE_CACHE,
+    CURATE_EXCEL_RESULT_CACHE,
+    CURATE_EXCEL_STREAMING_READER,
+    CURATE_SCHEMA_CACHE_SIZE,
+)
 from core_curate_app.utils.parser import get_parser
 from core_curate_app.views.user import views as curate_user_views
 from core_main_app.commons.exceptions import JSONError
@@ -42,8 +59,13 @@ from core_parser_app.tools.parser.parser import remove_child_element
 from core_parser_app.tools.parser.renderer.list import ListRenderer
 from xml_utils.xsd_tree.xsd_tree import XSDTree
 
-from core_curate_app.pythoncodes.xmlprocessing import process_xml_final, process_xml_final_R, validate_record
-schema_cache = {}
+from core_curate_app.pythoncodes.cache import ContentCache
+from core_curate_app.pythoncodes.jobs import JobManager
+from core_curate_app.pythoncodes.xmlprocessing import SHEET_EXCEL_TYPES, compile_schemas, extract_incremental, extraction_cache_key, get_test_schema_version, iter_xml_final, process_xml_final, process_xml_final_R, validate_record, validate_test_document
+schema_cache = ContentCache(compile_schemas, CURATE_SCHEMA_CACHE_SIZE)
+extraction_jobs = JobManager(
+    CURATE_EXCEL_JOB_WORKERS, CURATE_EXCEL_JOB_TTL, CURATE_EXCEL_JOB_CACHE
+)
 
 logger = logging.getLogger(__name__)
 
@@ -109,6 +131,46 @@ def save_xml_data(request):
     else:
         return HttpResponseBadRequest("Invalid request method")
 
+@decorators.permission_required(
+    content_type=rights.CURATE_CONTENT_TYPE,
+    permission=rights.CURATE_ACCESS,
+    raise_exception=True,
+)
+def save_xml_data_batch(request):
+    """Save a batch of records as new data in one transaction.
+
+    The records are posted as a JSON list of objects with the xml_data, title and template_id fields of
+    save_xml_data. Either all records are saved and their data ids returned in the same order, or none is.
+    """
+    if request.method != 'POST':
+        return HttpResponseBadRequest("Invalid request method")
+
+    try:
+        records = json.loads(request.POST.get("records", ""))
+    except ValueError:
+        return HttpResponseBadRequest("Invalid records, a JSON list is expected.")
+    if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+        return HttpResponseBadRequest("Invalid records, a JSON list is expected.")
+    for record in records:
+        if not record.get("xml_data") or not record.get("title") or not record.get("template_id"):
+            return HttpResponseBadRequest("Missing required data")
+
+    try:
+        templates = {}
+        for record in records:
+            template_id = str(record["template_id"])
+            if template_id not in templates:
+                templates[template_id] = template_api.get_by_id(template_id, request=request)
+        data_list = _create_data_batch(
+            [(record["xml_data"], record["title"], templates[str(record["template_id"])]) for record in records],
+            request,
+        )
+        return JsonResponse({"data_ids": [str(data.id) for data in data_list]})
+
+    except Exception as exception:
+        return HttpResponseBadRequest(str(exception).replace('"', "'"), content_type="application/javascript")
+
+
 @decorators.permission_required(
     content_type=rights.CURATE_CONTENT_TYPE,
     permission=rights.CURATE_ACCESS,
@@ -128,16 +190,34 @@ def extractxml(request):
         return JsonResponse({"error": "No sheet selected"}, status=400)
 
     try:
-        if sheet == 'Rows':
-            xml_dict = process_xml_final_R(excel_file)
-        elif sheet == 'Columns':
-            xml_dict = process_xml_final(excel_file)
-        else:
+        if sheet not in SHEET_EXCEL_TYPES:
             return JsonResponse({"error": "Failed: No such sheet exists, please check you file."}, status=400)
+        excel_type = SHEET_EXCEL_TYPES[sheet]
 
+        content = excel_file.read()
         excel_file.close()
-        
-        return JsonResponse(xml_dict)
+        validate = request.POST.get('validate') == 'true'
+        lineage = _get_lineage_key(request.user.id, excel_file.name)
+
+        if request.POST.get('async') == 'true':
+            if lineage is None:
+                job = extraction_jobs.submit(_extract_xml, content, excel_type, validate, owner=request.user.id)
+            else:
+                job = extraction_jobs.submit(
+                    _extract_xml_incremental, content, excel_type, lineage, validate, owner=request.user.id
+                )
+            return JsonResponse({"job_id": job.id}, status=202)
+
+        if request.POST.get('format') == 'ndjson':
+            errors = []
+            lines = _iter_ndjson_records(_iter_extracted_xml(content, excel_type, errors), validate, errors)
+            return StreamingHttpResponse(lines, content_type="application/x-ndjson")
+
+        if lineage is None:
+            extraction = _extract_xml(content, excel_type, validate)
+        else:
+            extraction = _extract_xml_incremental(content, excel_type, lineage, validate)
+        return JsonResponse(extraction)
     
     except Exception as e:
         if 'excel_file' in locals():
@@ -145,6 +225,273 @@ def extractxml(request):
         return JsonResponse({"error": str(e)}, status=500)
 
 
+def _extraction_options():
+    """Return the options of the extraction of uploaded workbooks."""
+    return {
+        "streaming": CURATE_EXCEL_STREAMING_READER,
+        "workers": CURATE_EXCEL_EXTRACTION_WORKERS,
+        "chunk_size": CURATE_EXCEL_EXTRACTION_CHUNK_SIZE,
+    }
+
+
+def _extract_xml(content, excel_type, validate=False, progress=None):
+    """Return the named records of a workbook under "records", from the result cache if it was already extracted.
+
+    With validate, each record is returned with the result of its validation against the
+    AsphaltDB schema of its test. Records that can't be extracted are left out and listed under
+    "errors" with their Excel row or column.
+    """
+    process = process_xml_final_R if excel_type == "R" else process_xml_final
+    if CURATE_EXCEL_RESULT_CACHE is None:
+        errors = []
+        xml_dict = process(BytesIO(content), progress=progress, errors=errors, **_extraction_options())
+    else:
+        result_cache = caches[CURATE_EXCEL_RESULT_CACHE]
+        key = extraction_cache_key(content, excel_type, CURATE_EXCEL_STREAMING_READER)
+        extraction = result_cache.get(key)
+        if extraction is None:
+            errors = []
+            xml_dict = process(BytesIO(content), progress=progress, errors=errors, **_extraction_options())
+            result_cache.set(key, {"records": xml_dict, "errors": errors})
+        else:
+            xml_dict, errors = extraction["records"], extraction["errors"]
+
+    if validate:
+        validated = {}
+        for name, xml in xml_dict.items():
+            validated[name] = {"xml": xml, "validation": validate_test_document(xml)}
+            if progress is not None:
+                progress("validating", len(validated), len(xml_dict))
+        xml_dict = validated
+    return {"records": xml_dict, "errors": errors}
+
+
+def _get_lineage_key(user_id, filename):
+    """Return the cache key of the last extraction of the workbooks uploaded by a user under a file name.
+
+    Returns None if incremental extraction is disabled.
+    """
+    if CURATE_EXCEL_LINEAGE_CACHE is None:
+        return None
+    digest = hashlib.sha256(filename.encode("utf-8")).hexdigest()
+    return f"curate_excel_lineage:{user_id}:{digest}"
+
+
+def _extract_xml_incremental(content, excel_type, lineage, validate=False, progress=None):
+    """Return the named records of a workbook as _extract_xml does, with the names of the new, changed,
+    removed and unchanged records since the last extraction of its lineage under "changes".
+
+    Only new and changed records are extracted and validated, the others are taken from the last extraction.
+    Validation results are only reused while the AsphaltDB schema files are unchanged.
+    """
+    lineage_cache = caches[CURATE_EXCEL_LINEAGE_CACHE]
+    previous = lineage_cache.get(lineage)
+    errors = []
+    xml_dict, changes, state = extract_incremental(
+        BytesIO(content), excel_type, previous, CURATE_EXCEL_STREAMING_READER, progress, errors
+    )
+
+    schema_version = get_test_schema_version()
+    validations_before = {}
+    if previous is not None and previous.get("schema_version") == schema_version:
+        validations_before = previous.get("validation", {})
+    validations = {name: validations_before[name] for name in changes["unchanged"] if name in validations_before}
+    if validate:
+        validated = {}
+        for name, xml in xml_dict.items():
+            if name not in validations:
+                validations[name] = validate_test_document(xml)
+            validated[name] = {"xml": xml, "validation": validations[name]}
+            if progress is not None:
+                progress("validating", len(validated), len(xml_dict))
+        xml_dict = validated
+    state["validation"] = validations
+    state["schema_version"] = schema_version
+    lineage_cache.set(lineage, state)
+
+    return {"records": xml_dict, "errors": errors, "changes": changes}
+
+
+def _iter_extracted_xml(content, excel_type, errors=None):
+    """Yield the named records of a workbook as they are extracted, or from the result cache.
+
+    Records that can't be extracted are added to the errors list, if given, as soon as they fail.
+    """
+    if errors is None:
+        errors = []
+    if CURATE_EXCEL_RESULT_CACHE is None:
+        yield from iter_xml_final(BytesIO(content), excel_type, errors=errors, **_extraction_options())
+        return
+
+    result_cache = caches[CURATE_EXCEL_RESULT_CACHE]
+    key = extraction_cache_key(content, excel_type, CURATE_EXCEL_STREAMING_READER)
+    extraction = result_cache.get(key)
+    if extraction is not None:
+        errors.extend(extraction["errors"])
+        yield from extraction["records"].items()
+        return
+
+    xml_dict = {}
+    for name, xml in iter_xml_final(BytesIO(content), excel_type, errors=errors, **_extraction_options()):
+        xml_dict[name] = xml
+        yield name, xml
+    result_cache.set(key, {"records": xml_dict, "errors": list(errors)})
+
+
+def _iter_ndjson_records(named_records, validate=False, errors=None):
+    """Yield one NDJSON line per named record, and a last line with the error if the extraction fails.
+
+    With validate, each line also has the result of the validation of the record. Records added to
+    the errors list while extracting get a line with their Excel row or column and their error.
+    """
+    if errors is None:
+        errors = []
+    sent = 0
+    try:
+        for name, xml in named_records:
+            for error in errors[sent:]:
+                yield json.dumps(error) + "\n"
+            sent = len(errors)
+            record = {"name": name, "xml": xml}
+            if validate:
+                record["validation"] = validate_test_document(xml)
+            yield json.dumps(record) + "\n"
+        for error in errors[sent:]:
+            yield json.dumps(error) + "\n"
+    except Exception as e:
+        yield json.dumps({"error": str(e)}) + "\n"
+
+
+@decorators.permission_required(
+    content_type=rights.CURATE_CONTENT_TYPE,
+    permission=rights.CURATE_ACCESS,
+    raise_exception=True,
+)
+def extractxml_job(request, job_id):
+    """Return the status of an extraction job of the user, with its result once done."""
+    job = extraction_jobs.get(job_id)
+    if job is None or job.owner != request.user.id:
+        return JsonResponse({"error": "No such extraction job, it may have expired."}, status=404)
+    return JsonResponse(job.to_dict())
+
+
+@decorators.permission_required(
+    content_type=rights.CURATE_CONTENT_TYPE,
+    permission=rights.CURATE_ACCESS,
+    raise_exception=True,
+)
+def ingestxml(request):
+    """Extract the records of a workbook, validate them against a template and save the valid ones as data.
+
+    Records are not returned: the response has the ids of the saved data and the errors of the other
+    records. With async=true, the ingestion runs as a job polled with extractxml_job.
+    """
+    if request.method != 'POST':
+        return HttpResponseBadRequest("Invalid request method.")
+
+    if 'excelFile' not in request.FILES:
+        return JsonResponse({"error": "No file uploaded"}, status=400)
+    sheet = request.POST.get('sheet')
+    if sheet not in SHEET_EXCEL_TYPES:
+        return JsonResponse({"error": "Failed: No such sheet exists, please check you file."}, status=400)
+    template_id = request.POST.get("template_id", "").strip()
+    if not template_id:
+        return JsonResponse({"error": "Missing template ID."}, status=400)
+
+    excel_file = request.FILES['excelFile']
+    content = excel_file.read()
+    excel_file.close()
+    try:
+        template = _get_xsd_template(template_id, request)
+
+        if request.POST.get('async') == 'true':
+            job = extraction_jobs.submit(
+                _run_ingest_job, content, SHEET_EXCEL_TYPES[sheet], template, request, owner=request.user.id
+            )
+            return JsonResponse({"job_id": job.id}, status=202)
+
+        return JsonResponse(_ingest_xml(content, SHEET_EXCEL_TYPES[sheet], template, request))
+
+    except CurateAjaxError as exception:
+        return JsonResponse({"error": exception.message}, status=400)
+    except Exception as e:
+        return JsonResponse({"error": str(e)}, status=500)
+
+
+def _ingest_xml(content, excel_type, template, request, progress=None):
+    """Save the records of a workbook that are valid for the template as data, and return the ids and errors."""
+    schema, fast_schema = schema_cache.get(str(template.id), template.content)
+    valid_records = []
+    failures = []
+    errors = []
+    for name, xml in _iter_extracted_xml(content, excel_type, errors):
+        validation_result = validate_record(xml, schema, fast_schema)
+        if validation_result != "VALID":
+            failures.append({"name": name, "errors": [validation_result]})
+        else:
+            valid_records.append((xml, name, template))
+        if progress is not None:
+            progress("validating", len(valid_records) + len(failures))
+
+    saved = []
+    if progress is not None:
+        progress("saving", 0, len(valid_records))
+    results = _create_data_batch(valid_records, request, isolate_errors=True)
+    for (_, name, _), result in zip(valid_records, results):
+        if isinstance(result, Exception):
+            failures.append({"name": name, "errors": [str(result)]})
+        else:
+            saved.append({"name": name, "data_id": str(result.id)})
+    return {"saved": saved, "failures": failures, "errors": errors}
+
+
+def _run_ingest_job(*args, progress):
+    """Run _ingest_xml in a job thread, closing the database connection of the thread when done."""
+    try:
+        return _ingest_xml(*args, progress=progress)
+    finally:
+        connection.close()
+
+
+def _create_data(xml_data, title, template, request):
+    """Validate and save a record as new data of the user, then suffix its title with _AMUID and the data id.
+
+    As with save_xml_data, the data file is named after the final title. The id is only known once the data is saved,
+    so the data is saved twice, but the content is only validated and converted to a dict once: the second save only
+    renames the file.
+    """
+    data = Data(user_id=str(request.user.id))
+    data.content = xml_data
+    data.title = title
+    data.template = template
+    data = data_api.upsert(data, request)
+    data.title = f"{title}_AMUID{data.pk}"
+    data.convert_to_file()
+    data.save_object()
+    return data
+
+
+def _create_data_batch(records, request, isolate_errors=False):
+    """Save records as new data of the user in one transaction, and return the data in order.
+
+    Records are (xml_data, title, template) tuples, saved with _create_data. With isolate_errors, a record
+    that can't be saved is rolled back alone and its exception returned in place of its data, otherwise
+    the first error rolls back the batch and is raised.
+    """
+    results = []
+    with transaction.atomic():
+        for xml_data, title, template in records:
+            if not isolate_errors:
+                results.append(_create_data(xml_data, title, template, request))
+                continue
+            try:
+                with transaction.atomic():
+                    results.append(_create_data(xml_data, title, template, request))
+            except Exception as e:
+                results.append(e)
+    return results
+
+
 @decorators.permission_required(
     content_type=rights.CURATE_CONTENT_TYPE,
     permission=rights.CURATE_ACCESS,
@@ -169,11 +516,9 @@ def validaterecord(request):
             return HttpResponseBadRequest("Provided template is not an XSD format.")
 
 #        schema = xmlschema.XMLSchema(template.content)
-        if template_id not in schema_cache:
-            schema_cache[template_id] = xmlschema.XMLSchema(template.content)
-        schema = schema_cache[template_id]
+        schema, fast_schema = schema_cache.get(template_id, template.content)
 
-        validation_result = validate_record(xml_content, schema)
+        validation_result = validate_record(xml_content, schema, fast_schema)
         
         if validation_result == "VALID":
             response_dict["message"] = "VALID"
@@ -189,6 +534,84 @@ def validaterecord(request):
     
     return JsonResponse(response_dict)
 
+@decorators.permission_required(
+    content_type=rights.CURATE_CONTENT_TYPE,
+    permission=rights.CURATE_ACCESS,
+    raise_exception=True,
+)
+def validaterecords(request):
+    """Validate a batch of records against their templates in one request.
+
+    The records are posted as a JSON list of objects with the xml_dt and template_id fields of
+    validaterecord. Results are returned in the same order, as validaterecord returns them.
+    """
+    if request.method != 'POST':
+        return HttpResponseBadRequest("Invalid request method.")
+
+    try:
+        records = json.loads(request.POST.get("records", ""))
+    except ValueError:
+        return HttpResponseBadRequest("Invalid records, a JSON list is expected.")
+    if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+        return HttpResponseBadRequest("Invalid records, a JSON list is expected.")
+
+    results = [None] * len(records)
+    schemas = {}
+    to_validate = []
+    for index, record in enumerate(records):
+        xml_content = str(record.get("xml_dt") or "").strip()
+        template_id = str(record.get("template_id") or "").strip()
+        if not xml_content:
+            results[index] = {"errors": ["Missing XML data."]}
+            continue
+        if not template_id:
+            results[index] = {"errors": ["Missing template ID."]}
+            continue
+        # templates are loaded in the request thread, once per template
+        if template_id not in schemas:
+            try:
+                schemas[template_id] = _get_xsd_schema(template_id, request)
+            except CurateAjaxError as exception:
+                schemas[template_id] = exception.message
+            except Exception as e:
+                schemas[template_id] = f"Unexpected Error: {str(e)}"
+        schema = schemas[template_id]
+        if isinstance(schema, str):
+            results[index] = {"errors": [schema]}
+            continue
+        to_validate.append((index, xml_content, schema))
+
+    def validate(item):
+        return validate_record(item[1], *item[2])
+
+    if CURATE_BATCH_VALIDATION_WORKERS > 1 and len(to_validate) > 1:
+        with ThreadPoolExecutor(max_workers=CURATE_BATCH_VALIDATION_WORKERS) as executor:
+            validation_results = list(executor.map(validate, to_validate))
+    else:
+        validation_results = [validate(item) for item in to_validate]
+    for (index, _, _), validation_result in zip(to_validate, validation_results):
+        if validation_result == "VALID":
+            results[index] = {"message": "VALID"}
+        else:
+            results[index] = {"errors": [validation_result]}
+
+    return JsonResponse({"results": results})
+
+
+def _get_xsd_template(template_id, request):
+    """Return a template, raising CurateAjaxError if it is not an XSD template."""
+    template = template_api.get_by_id(template_id, request=request)
+    if template.format != "XSD":
+        raise CurateAjaxError("Provided template is not an XSD format.")
+    return template
+
+
+def _get_xsd_schema(template_id, request):
+    """Return the xmlschema and lxml compiled schemas of an XSD template, from the schema cache."""
+    template = _get_xsd_template(template_id, request)
+    return schema_cache.get(template_id, template.content)
+
+
 @decorators.permission_required(
     content_type=rights.CURATE_CONTENT_TYPE,
     permission=rights.CURATE_ACCESS,
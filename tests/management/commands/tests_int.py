@@ -0,0 +1,113 @@
+""" Integration tests of the management commands
+"""
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core_curate_app.pythoncodes import xmlprocessing
+from core_main_app.components.template.models import Template
+from core_main_app.components.template_version_manager.models import (
+    TemplateVersionManager,
+)
+
+XSD = (
+    '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">'
+    '<xs:element name="{}"/></xs:schema>'
+)
+
+
+def _create_template(name, is_disabled=False):
+    """Create a current XSD template in its own version manager.
+
+    Args:
+        name: name of the root element of the schema
+        is_disabled: disable the version manager
+
+    Returns:
+
+    """
+    version_manager = TemplateVersionManager(
+        title=name, user=None, is_disabled=is_disabled
+    )
+    version_manager.save()
+    template = Template(
+        filename=f"{name}.xsd",
+        content=XSD.format(name),
+        _hash=name,
+        version_manager=version_manager,
+        is_current=True,
+    )
+    template.save_template()
+    return template
+
+
+class TestCompileSchemasCommand(TestCase):
+    """Test the compileschemas command"""
+
+    def setUp(self):
+        """setUp
+
+        Returns:
+
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        schema_disk_cache = xmlprocessing.schema_disk_cache
+        self.addCleanup(
+            setattr, xmlprocessing, "schema_disk_cache", schema_disk_cache
+        )
+        self.enabled = _create_template("enabled")
+        self.disabled = _create_template("disabled", is_disabled=True)
+
+    def _compile(self):
+        """Run the command in the test directory and return its output.
+
+        Returns:
+
+        """
+        stdout = StringIO()
+        with patch.object(xmlprocessing, "get_test_schema"):
+            call_command(
+                "compileschemas",
+                "--directory",
+                self.directory.name,
+                stdout=stdout,
+            )
+        return stdout.getvalue()
+
+    def test_compileschemas_only_compiles_enabled_templates(self):
+        """test_compileschemas_only_compiles_enabled_templates
+
+        Returns:
+
+        """
+        output = self._compile()
+
+        disk_cache = xmlprocessing.schema_disk_cache
+        self.assertTrue(disk_cache.contains(self.enabled.content))
+        self.assertFalse(disk_cache.contains(self.disabled.content))
+        self.assertEqual(
+            os.listdir(self.directory.name),
+            [os.path.basename(disk_cache.path(self.enabled.content))],
+        )
+        self.assertIn("1 template schemas compiled, 0 failed", output)
+
+    def test_compileschemas_second_run_compiles_nothing(self):
+        """test_compileschemas_second_run_compiles_nothing
+
+        Returns:
+
+        """
+        self._compile()
+
+        with patch.object(
+            xmlprocessing, "compile_xmlschema"
+        ) as mock_compile_xmlschema:
+            output = self._compile()
+
+        mock_compile_xmlschema.assert_not_called()
+        self.assertIn("0 template schemas compiled, 0 failed", output)
@@ -0,0 +1,216 @@
+""" Test content caches from `pythoncodes.cache`.
+"""
+import os
+import tempfile
+import threading
+from unittest.case import TestCase
+from unittest.mock import MagicMock
+
+from core_curate_app.pythoncodes.cache import ContentCache, PickleCache
+
+
+class TestContentCache(TestCase):
+    """Test ContentCache"""
+
+    def setUp(self):
+        """setUp
+
+        Returns:
+
+        """
+        self.builder = MagicMock(side_effect=lambda content: [content])
+        self.cache = ContentCache(self.builder, max_size=2)
+
+    def test_get_builds_object_once_per_content(self):
+        """test_get_builds_object_once_per_content
+
+        Returns:
+
+        """
+        first = self.cache.get("1", "<xs:schema/>")
+
+        self.assertIs(self.cache.get("1", "<xs:schema/>"), first)
+        self.assertEqual(first, ["<xs:schema/>"])
+        self.assertEqual(self.builder.call_count, 1)
+        stats = self.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["builds"], 1)
+        self.assertGreaterEqual(stats["build_time"], 0)
+
+    def test_get_rebuilds_object_when_content_changes(self):
+        """test_get_rebuilds_object_when_content_changes
+
+        Returns:
+
+        """
+        self.cache.get("1", "a")
+
+        self.assertEqual(self.cache.get("1", "b"), ["b"])
+        self.assertEqual(self.cache.get("1", "a"), ["a"])
+        self.assertEqual(self.builder.call_count, 3)
+        self.assertEqual(self.cache.stats()["size"], 1)
+
+    def test_least_recently_used_object_is_evicted(self):
+        """test_least_recently_used_object_is_evicted
+
+        Returns:
+
+        """
+        self.cache.get("1", "a")
+        self.cache.get("2", "b")
+        self.cache.get("1", "a")
+        self.cache.get("3", "c")
+
+        self.cache.get("1", "a")
+        self.assertEqual(self.builder.call_count, 3)
+        self.cache.get("2", "b")
+        self.assertEqual(self.builder.call_count, 4)
+        self.assertEqual(self.cache.stats()["evictions"], 2)
+
+    def test_concurrent_gets_build_object_once(self):
+        """test_concurrent_gets_build_object_once
+
+        Returns:
+
+        """
+        started = threading.Event()
+        release = threading.Event()
+
+        def builder(content):
+            started.set()
+            release.wait(5)
+            return object()
+
+        builder_mock = MagicMock(side_effect=builder)
+        cache = ContentCache(builder_mock, max_size=2)
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(cache.get("1", "a"))
+            )
+            for _ in range(4)
+        ]
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(builder_mock.call_count, 1)
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_failed_build_is_not_cached(self):
+        """test_failed_build_is_not_cached
+
+        Returns:
+
+        """
+        self.builder.side_effect = [ValueError("bad schema"), ["a"]]
+
+        with self.assertRaises(ValueError):
+            self.cache.get("1", "a")
+
+        self.assertEqual(self.cache.get("1", "a"), ["a"])
+
+    def test_clear_removes_objects(self):
+        """test_clear_removes_objects
+
+        Returns:
+
+        """
+        self.cache.get("1", "a")
+        self.cache.clear()
+        self.cache.get("1", "a")
+
+        self.assertEqual(self.builder.call_count, 2)
+
+
+class TestPickleCache(TestCase):
+    """Test PickleCache"""
+
+    def setUp(self):
+        """setUp
+
+        Returns:
+
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.cache = PickleCache(self.directory.name, "test")
+
+    def test_get_builds_and_stores_object(self):
+        """test_get_builds_and_stores_object
+
+        Returns:
+
+        """
+        builder = MagicMock(return_value={"compiled": 1})
+
+        value = self.cache.get("<xs:schema/>", builder)
+
+        self.assertEqual(value, {"compiled": 1})
+        self.assertTrue(self.cache.contains("<xs:schema/>"))
+        self.assertTrue(
+            os.path.basename(self.cache.path("<xs:schema/>")).startswith(
+                "test-"
+            )
+        )
+        self.assertEqual(builder.call_count, 1)
+
+    def test_get_loads_stored_object_in_other_cache(self):
+        """test_get_loads_stored_object_in_other_cache
+
+        Returns:
+
+        """
+        self.cache.get(b"<xs:schema/>", lambda: {"compiled": 1})
+        builder = MagicMock()
+
+        value = PickleCache(self.directory.name, "test").get(
+            "<xs:schema/>", builder
+        )
+
+        self.assertEqual(value, {"compiled": 1})
+        builder.assert_not_called()
+
+    def test_get_rebuilds_object_when_content_changes(self):
+        """test_get_rebuilds_object_when_content_changes
+
+        Returns:
+
+        """
+        self.cache.get("<xs:schema/>", lambda: 1)
+
+        self.assertEqual(self.cache.get("<xs:schema />", lambda: 2), 2)
+        self.assertFalse(
+            PickleCache(self.directory.name, "other").contains("<xs:schema/>")
+        )
+
+    def test_get_rebuilds_unreadable_file(self):
+        """test_get_rebuilds_unreadable_file
+
+        Returns:
+
+        """
+        with open(self.cache.path("<xs:schema/>"), "wb") as file:
+            file.write(b"truncated")
+
+        self.assertEqual(self.cache.get("<xs:schema/>", lambda: 1), 1)
+        self.assertEqual(self.cache.get("<xs:schema/>", MagicMock()), 1)
+
+    def test_get_returns_object_when_write_fails(self):
+        """test_get_returns_object_when_write_fails
+
+        Returns:
+
+        """
+        value = self.cache.get("<xs:schema/>", lambda: threading.Lock())
+
+        self.assertIsNotNone(value)
+        self.assertFalse(self.cache.contains("<xs:schema/>"))
+        self.assertEqual(
+            [name for name in os.listdir(self.directory.name)], []
+        )
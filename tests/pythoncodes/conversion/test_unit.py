@@ -0,0 +1,122 @@
+""" Test workbook conversion from `pythoncodes.conversion`.
+"""
+import os
+import tempfile
+from unittest.case import TestCase
+from unittest.mock import patch
+
+from core_curate_app.pythoncodes import conversion, xmlprocessing
+
+
+def _iter_xml_final(path, excel_type, streaming, errors):
+    """Name the documents of a fake workbook after its file name.
+
+    Args:
+        path:
+        excel_type:
+        streaming:
+        errors:
+
+    Returns:
+
+    """
+    with open(path, encoding="utf-8") as file:
+        content = file.read()
+    if content == "unreadable":
+        raise ValueError("Worksheet not found")
+    yield "Row 12 - Rutting", f"<RuttingExp>{content}</RuttingExp>"
+    errors.append({"row": 13, "stage": "building", "error": "bad"})
+    yield "Row 14 - ITS", f"<ITSExp>{content}</ITSExp>"
+
+
+class TestDocumentFilename(TestCase):
+    """Test document_filename"""
+
+    def test_document_filename_replaces_separators(self):
+        """test_document_filename_replaces_separators
+
+        Returns:
+
+        """
+        self.assertEqual(
+            conversion.document_filename("Row 12 - Rutting"),
+            "Row_12_Rutting.xml",
+        )
+        self.assertEqual(
+            conversion.document_filename("Column 'L' - ITS"),
+            "Column_L_ITS.xml",
+        )
+
+
+class TestConvertDirectory(TestCase):
+    """Test convert_directory"""
+
+    def setUp(self):
+        """setUp
+
+        Returns:
+
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.input = os.path.join(self.directory.name, "input")
+        self.output = os.path.join(self.directory.name, "output")
+        for path, content in [
+            ("a.xlsx", "a"),
+            ("2020/b.xlsx", "b"),
+            ("2020/~$b.xlsx", "lock"),
+            ("notes.txt", "notes"),
+            ("c.xlsx", "unreadable"),
+        ]:
+            path = os.path.join(self.input, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(content)
+
+    def tearDown(self):
+        """tearDown
+
+        Returns:
+
+        """
+        self.directory.cleanup()
+
+    @patch.object(xmlprocessing, "iter_xml_final", _iter_xml_final)
+    def test_convert_directory_writes_documents_of_each_workbook(self):
+        """test_convert_directory_writes_documents_of_each_workbook
+
+        Returns:
+
+        """
+        results = list(
+            conversion.convert_directory(self.input, self.output, "C")
+        )
+
+        self.assertEqual(
+            [
+                os.path.relpath(result["path"], self.input)
+                for result in results
+            ],
+            ["a.xlsx", "c.xlsx", "2020/b.xlsx"],
+        )
+        self.assertEqual(results[2]["documents"], 2)
+        self.assertEqual(results[2]["errors"][0]["row"], 13)
+        with open(
+            os.path.join(self.output, "2020", "b", "Row_14_ITS.xml"),
+            encoding="utf-8",
+        ) as file:
+            self.assertEqual(file.read(), "<ITSExp>b</ITSExp>")
+
+    @patch.object(xmlprocessing, "iter_xml_final", _iter_xml_final)
+    def test_unreadable_workbook_returns_error(self):
+        """test_unreadable_workbook_returns_error
+
+        Returns:
+
+        """
+        results = list(
+            conversion.convert_directory(self.input, self.output, "C")
+        )
+
+        self.assertEqual(results[1]["documents"], 0)
+        self.assertEqual(results[1]["error"], "Worksheet not found")
+        self.assertIsNone(results[0]["error"])
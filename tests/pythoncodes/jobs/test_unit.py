@@ -0,0 +1,165 @@
+""" Test background jobs from `pythoncodes.jobs`.
+"""
+import threading
+from unittest.case import TestCase
+
+from core_curate_app.pythoncodes.jobs import (
+    JOB_DONE,
+    JOB_FAILED,
+    JOB_RUNNING,
+    JobManager,
+)
+
+
+def _wait_for(job):
+    """Wait for a job to finish.
+
+    Args:
+        job:
+
+    Returns:
+
+    """
+    for _ in range(500):
+        if job.finished_at is not None:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError("job did not finish")
+
+
+class TestJobManager(TestCase):
+    """Test JobManager"""
+
+    def setUp(self):
+        """setUp
+
+        Returns:
+
+        """
+        self.manager = JobManager(max_workers=1, ttl=60)
+
+    def test_submit_runs_function_and_stores_result(self):
+        """test_submit_runs_function_and_stores_result
+
+        Returns:
+
+        """
+
+        def function(value, progress, suffix=""):
+            progress("extracting", 3, 4)
+            return value + suffix
+
+        job = self.manager.submit(function, "a", owner=1, suffix="b")
+        _wait_for(job)
+
+        self.assertEqual(
+            self.manager.get(job.id).to_dict(),
+            {
+                "job_id": job.id,
+                "status": JOB_DONE,
+                "stage": "extracting",
+                "rows_processed": 3,
+                "rows_total": 4,
+                "result": "ab",
+            },
+        )
+        self.assertEqual(self.manager.get(job.id).owner, 1)
+
+    def test_job_is_polled_through_another_manager(self):
+        """test_job_is_polled_through_another_manager
+
+        Returns:
+
+        """
+        reported = threading.Event()
+        release = threading.Event()
+
+        def function(progress):
+            progress("extracting", 2, 4)
+            reported.set()
+            release.wait(5)
+            return {"Row 12 - A": "<A/>"}
+
+        job = self.manager.submit(function, owner=1)
+        reported.wait(5)
+        other_manager = JobManager(max_workers=1, ttl=60)
+
+        running = other_manager.get(job.id)
+        self.assertEqual(running.owner, 1)
+        self.assertEqual(running.status, JOB_RUNNING)
+        self.assertEqual(running.rows_processed, 2)
+        release.set()
+        _wait_for(job)
+        self.assertEqual(
+            other_manager.get(job.id).to_dict(),
+            {
+                "job_id": job.id,
+                "status": JOB_DONE,
+                "stage": "extracting",
+                "rows_processed": 2,
+                "rows_total": 4,
+                "result": {"Row 12 - A": "<A/>"},
+            },
+        )
+
+    def test_failed_job_reports_error(self):
+        """test_failed_job_reports_error
+
+        Returns:
+
+        """
+
+        def function(progress):
+            raise ValueError("bad workbook")
+
+        job = self.manager.submit(function)
+        _wait_for(job)
+
+        status = self.manager.get(job.id).to_dict()
+        self.assertEqual(status["status"], JOB_FAILED)
+        self.assertEqual(status["error"], "bad workbook")
+        self.assertNotIn("result", status)
+
+    def test_running_job_reports_progress(self):
+        """test_running_job_reports_progress
+
+        Returns:
+
+        """
+        reported = threading.Event()
+        release = threading.Event()
+
+        def function(progress):
+            progress("reading")
+            reported.set()
+            release.wait(5)
+
+        job = self.manager.submit(function)
+        reported.wait(5)
+
+        running = self.manager.get(job.id)
+        self.assertEqual(running.status, JOB_RUNNING)
+        self.assertEqual(running.stage, "reading")
+        release.set()
+        _wait_for(job)
+
+    def test_finished_job_expires_after_ttl(self):
+        """test_finished_job_expires_after_ttl
+
+        Returns:
+
+        """
+        manager = JobManager(max_workers=1, ttl=1)
+        job = manager.submit(lambda progress: None)
+        _wait_for(job)
+        threading.Event().wait(1.1)
+
+        self.assertIsNone(manager.get(job.id))
+
+    def test_get_unknown_job_returns_none(self):
+        """test_get_unknown_job_returns_none
+
+        Returns:
+
+        """
+        self.assertIsNone(self.manager.get("unknown"))
@@ -0,0 +1,112 @@
+""" Test mapping plans from `pythoncodes.mapping`.
+"""
+import xml.etree.ElementTree as ET
+from unittest.case import TestCase
+
+import pandas as pd
+
+from core_curate_app.pythoncodes import xmlprocessing
+from core_curate_app.pythoncodes.mapping import MappingPlan
+
+COL_TO_PATHS = {
+    ("A", "x"): ["Root.First.Value"],
+    ("A", "y"): ["Root.Second"],
+    ("B", "x"): ["Root.First.Unit", "Other"],
+}
+
+
+class TestMappingPlan(TestCase):
+    """Test MappingPlan"""
+
+    def test_shared_prefixes_are_compiled_once(self):
+        """test_shared_prefixes_are_compiled_once
+
+        Returns:
+
+        """
+        plan = MappingPlan(COL_TO_PATHS)
+
+        self.assertEqual(
+            plan.tags,
+            [None, "Root", "First", "Value", "Second", "Unit", "Other"],
+        )
+        self.assertEqual(plan.parents, [None, 0, 1, 2, 1, 2, 0])
+
+    def test_build_creates_elements_in_first_use_order(self):
+        """test_build_creates_elements_in_first_use_order
+
+        Returns:
+
+        """
+        plan = MappingPlan(COL_TO_PATHS)
+
+        root = plan.build("Record", [None, "2", "mm"])
+
+        self.assertEqual(
+            ET.tostring(root, encoding="unicode"),
+            "<Record><Root><Second>2</Second><First><Unit>mm</Unit></First>"
+            "</Root><Other>mm</Other></Record>",
+        )
+
+    def test_resolve_returns_none_for_missing_columns(self):
+        """test_resolve_returns_none_for_missing_columns
+
+        Returns:
+
+        """
+        plan = MappingPlan(COL_TO_PATHS)
+        columns = pd.MultiIndex.from_tuples([("B", "x"), ("A", "x")])
+
+        with self.assertLogs(
+            "core_curate_app.pythoncodes.mapping", "WARNING"
+        ) as logs:
+            positions = plan.resolve(columns)
+
+        self.assertEqual(positions, [1, None, 0])
+        self.assertIn("('A', 'y')", logs.output[0])
+
+    def test_resolve_returns_first_position_of_duplicated_columns(self):
+        """test_resolve_returns_first_position_of_duplicated_columns
+
+        Returns:
+
+        """
+        plan = MappingPlan(COL_TO_PATHS)
+        columns = pd.MultiIndex.from_tuples(
+            [("A", "y"), ("A", "x"), ("B", "x"), ("A", "x")]
+        )
+
+        self.assertEqual(plan.resolve(columns), [1, 0, 2])
+
+
+class TestBuildRecordTexts(TestCase):
+    """Test MappingPlan.build with iter_record_texts"""
+
+    def test_build_record_texts_matches_xml_creator(self):
+        """test_build_record_texts_matches_xml_creator
+
+        Returns:
+
+        """
+        df = pd.DataFrame(
+            [
+                [1.0, "a;b", pd.Timestamp("2020-01-02")],
+                [float("nan"), "", pd.NaT],
+                [2.5, "c", pd.Timestamp("2021-03-04")],
+            ],
+            columns=pd.MultiIndex.from_tuples(list(COL_TO_PATHS)),
+        )
+        plan = MappingPlan(COL_TO_PATHS)
+
+        records = [
+            ET.tostring(plan.build("Record", texts), encoding="unicode")
+            for texts in xmlprocessing.iter_record_texts(df, plan)
+        ]
+
+        self.assertEqual(
+            records,
+            [
+                xmlprocessing.xml_creator(row, COL_TO_PATHS, "Record")
+                for _, row in df.iterrows()
+            ],
+        )
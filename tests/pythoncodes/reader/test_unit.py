@@ -0,0 +1,257 @@
+""" Test workbook readers from `pythoncodes.reader`.
+"""
+import datetime
+import math
+from io import BytesIO
+from unittest.case import TestCase
+
+from openpyxl import Workbook
+
+from core_curate_app.pythoncodes.reader import (
+    ColumnsSheetReader,
+    RowsSheetReader,
+    build_header,
+    convert_data_cell,
+    is_missing,
+)
+
+
+def _columns_workbook(rows):
+    """Build a Columns workbook with a two column, 9 level header.
+
+    Args:
+        rows:
+
+    Returns:
+
+    """
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Database (Columns)"
+    sheet.cell(row=1, column=1, value="ID")
+    sheet.cell(row=1, column=2, value="DataSource")
+    sheet.cell(row=2, column=2, value="Year")
+    sheet.cell(row=1, column=3, value="E")
+    for row_number, row in enumerate(rows, start=10):
+        for column_number, value in enumerate(row, start=1):
+            sheet.cell(row=row_number, column=column_number, value=value)
+    file = BytesIO()
+    workbook.save(file)
+    file.seek(0)
+    return file
+
+
+def _rows_workbook(fields):
+    """Build a Rows workbook, one sheet row per field.
+
+    Args:
+        fields: list of (header levels, values from column J) tuples
+
+    Returns:
+
+    """
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Database (Rows)"
+    for row_number, (levels, values) in enumerate(fields, start=1):
+        for column_number, value in enumerate(levels, start=1):
+            sheet.cell(row=row_number, column=column_number, value=value)
+        for column_number, value in enumerate(values, start=10):
+            sheet.cell(row=row_number, column=column_number, value=value)
+    file = BytesIO()
+    workbook.save(file)
+    file.seek(0)
+    return file
+
+
+class TestBuildHeader(TestCase):
+    """Test build_header"""
+
+    def test_build_header_names_blank_cells_like_pandas(self):
+        """test_build_header_names_blank_cells_like_pandas
+
+        Returns:
+
+        """
+        header = build_header([["A", None, "B"], [None, "x", "y"]])
+
+        self.assertEqual(
+            header,
+            [
+                ("A", "Unnamed: 0_level_1"),
+                ("A", "x"),
+                ("B", "y"),
+            ],
+        )
+
+    def test_build_header_converts_integer_floats(self):
+        """test_build_header_converts_integer_floats
+
+        Returns:
+
+        """
+        self.assertEqual(build_header([[1.0, 2.5]]), [(1,), (2.5,)])
+
+
+class TestIsMissing(TestCase):
+    """Test is_missing"""
+
+    def test_is_missing_returns_true_for_pandas_missing_values(self):
+        """test_is_missing_returns_true_for_pandas_missing_values
+
+        Returns:
+
+        """
+        for value in [None, "", "NA", "n/a", "#DIV/0!"]:
+            self.assertTrue(is_missing(value))
+
+    def test_is_missing_returns_false_for_values(self):
+        """test_is_missing_returns_false_for_values
+
+        Returns:
+
+        """
+        for value in [0, 0.0, False, " ", "NAN value"]:
+            self.assertFalse(is_missing(value))
+
+
+class TestConvertDataCell(TestCase):
+    """Test convert_data_cell"""
+
+    def test_convert_data_cell_converts_like_pandas(self):
+        """test_convert_data_cell_converts_like_pandas
+
+        Returns:
+
+        """
+        self.assertEqual(convert_data_cell(None), "")
+        self.assertTrue(math.isnan(convert_data_cell("#DIV/0!")))
+        self.assertEqual(type(convert_data_cell(2.0)), int)
+        self.assertEqual(convert_data_cell(2.5), 2.5)
+        self.assertIs(convert_data_cell(True), True)
+
+
+class TestColumnsSheetReader(TestCase):
+    """Test ColumnsSheetReader"""
+
+    def test_columns_are_read_from_header(self):
+        """test_columns_are_read_from_header
+
+        Returns:
+
+        """
+        with ColumnsSheetReader(
+            _columns_workbook([[None, "units"]])
+        ) as reader:
+            self.assertEqual(
+                reader.columns[1][:3],
+                ("DataSource", "Year", "Unnamed: 1_level_2"),
+            )
+            self.assertEqual(reader.columns[2][0], "E")
+
+    def test_example_and_empty_rows_are_skipped(self):
+        """test_example_and_empty_rows_are_skipped
+
+        Returns:
+
+        """
+        file = _columns_workbook(
+            [
+                [None, "units"],
+                ["example", 2000],
+                ["a", 2001],
+                [None, 2002],
+                ["b", datetime.datetime(2003, 1, 1)],
+            ]
+        )
+
+        with ColumnsSheetReader(file) as reader:
+            records = [(row_number, row[:2]) for row_number, row in reader]
+
+        self.assertEqual(
+            records,
+            [
+                (12, ("a", 2001)),
+                (14, ("b", datetime.datetime(2003, 1, 1))),
+            ],
+        )
+
+    def test_read_columns_keeps_positions_and_trims_empty_rows(self):
+        """test_read_columns_keeps_positions_and_trims_empty_rows
+
+        Returns:
+
+        """
+        file = _columns_workbook(
+            [
+                [None, "units", "e"],
+                ["a", 2001.0],
+                [None, None, "e"],
+                [None, None, None],
+            ]
+        )
+
+        with ColumnsSheetReader(file) as reader:
+            rows = reader.read_columns([0, 1])
+
+        self.assertEqual(rows, [["", "units"], ["a", 2001], ["", ""]])
+
+    def test_sheet_shorter_than_header_raises_value_error(self):
+        """test_sheet_shorter_than_header_raises_value_error
+
+        Returns:
+
+        """
+        with self.assertRaises(ValueError):
+            ColumnsSheetReader(_columns_workbook([]))
+
+    def test_missing_sheet_raises_value_error(self):
+        """test_missing_sheet_raises_value_error
+
+        Returns:
+
+        """
+        with self.assertRaises(ValueError):
+            ColumnsSheetReader(_columns_workbook([[None, "units"]]), "Other")
+
+
+class TestRowsSheetReader(TestCase):
+    """Test RowsSheetReader"""
+
+    def setUp(self):
+        """setUp
+
+        Returns:
+
+        """
+        self.file = _rows_workbook(
+            [
+                (["DataSource", "ID"], [None, "example", "a", None, "c"]),
+                (["DataSource"], ["section", "", "", "", ""]),
+                (["DataSource", "Year"], ["unit", 2000, 2001, 2002]),
+            ]
+        )
+
+    def test_fields_with_one_header_level_are_skipped(self):
+        """test_fields_with_one_header_level_are_skipped
+
+        Returns:
+
+        """
+        reader = RowsSheetReader(self.file)
+
+        self.assertEqual(
+            [column[:2] for column in reader.columns],
+            [("DataSource", "ID"), ("DataSource", "Year")],
+        )
+        self.assertTrue(math.isnan(reader.columns[0][2]))
+
+    def test_example_and_empty_columns_are_skipped(self):
+        """test_example_and_empty_columns_are_skipped
+
+        Returns:
+
+        """
+        records = list(RowsSheetReader(self.file))
+
+        self.assertEqual(records, [("L", ["a", 2001]), ("N", ["c", None])])
@@ -0,0 +1,125 @@
+""" Test registries from `pythoncodes.registry`.
+"""
+import os
+import tempfile
+import threading
+from unittest.case import TestCase
+from unittest.mock import MagicMock
+
+from core_curate_app.pythoncodes.registry import FileRegistry
+
+
+class TestFileRegistry(TestCase):
+    """Test FileRegistry"""
+
+    def setUp(self):
+        """setUp
+
+        Returns:
+
+        """
+        handle, self.path = tempfile.mkstemp()
+        os.close(handle)
+        self.loader = MagicMock(side_effect=lambda *paths: object())
+        self.registry = FileRegistry(self.loader)
+
+    def tearDown(self):
+        """tearDown
+
+        Returns:
+
+        """
+        os.remove(self.path)
+
+    def test_get_builds_object_once(self):
+        """test_get_builds_object_once
+
+        Returns:
+
+        """
+        first = self.registry.get(self.path)
+        second = self.registry.get(self.path)
+
+        self.assertIs(first, second)
+        self.loader.assert_called_once_with(os.path.abspath(self.path))
+
+    def test_get_rebuilds_object_when_mtime_changes(self):
+        """test_get_rebuilds_object_when_mtime_changes
+
+        Returns:
+
+        """
+        first = self.registry.get(self.path)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        second = self.registry.get(self.path)
+
+        self.assertIsNot(first, second)
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_get_builds_object_once_when_called_concurrently(self):
+        """test_get_builds_object_once_when_called_concurrently
+
+        Returns:
+
+        """
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(self.registry.get(self.path))
+            )
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.loader.call_count, 1)
+        self.assertEqual(len(set(map(id, results))), 1)
+
+    def test_is_loaded_returns_false_before_first_get(self):
+        """test_is_loaded_returns_false_before_first_get
+
+        Returns:
+
+        """
+        self.assertFalse(self.registry.is_loaded(self.path))
+        self.registry.get(self.path)
+        self.assertTrue(self.registry.is_loaded(self.path))
+
+    def test_clear_forces_rebuild(self):
+        """test_clear_forces_rebuild
+
+        Returns:
+
+        """
+        self.registry.get(self.path)
+        self.registry.clear()
+        self.registry.get(self.path)
+
+        self.assertEqual(self.loader.call_count, 2)
+
+    def test_get_builds_object_from_several_files(self):
+        """test_get_builds_object_from_several_files
+
+        Returns:
+
+        """
+        handle, other_path = tempfile.mkstemp()
+        os.close(handle)
+        self.addCleanup(os.remove, other_path)
+
+        first = self.registry.get(self.path, other_path)
+        stat = os.stat(other_path)
+        os.utime(other_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        second = self.registry.get(self.path, other_path)
+
+        self.assertIsNot(first, second)
+        self.assertIsNot(first, self.registry.get(self.path))
+        self.assertEqual(
+            self.loader.call_args_list[0].args,
+            (os.path.abspath(self.path), os.path.abspath(other_path)),
+        )
+        self.assertEqual(self.loader.call_count, 3)
@@ -0,0 +1,175 @@
+""" Test schema merge from `pythoncodes.schema_store`.
+"""
+from unittest.case import TestCase
+
+import xmlschema
+from lxml import etree
+
+from core_curate_app.pythoncodes import xmlprocessing
+from core_curate_app.pythoncodes.schema_store import merge_schemas
+
+XSD = '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">{}</xs:schema>'
+
+SOURCE_TYPE = (
+    '<xs:complexType name="SourceType"><xs:sequence>'
+    '<xs:element name="Year" type="YearType"/>'
+    "</xs:sequence></xs:complexType>"
+)
+
+INTEGER_YEAR = (
+    '<xs:simpleType name="YearType">'
+    '<xs:restriction base="xs:integer"/></xs:simpleType>'
+)
+
+STRING_YEAR = (
+    '<xs:simpleType name="YearType">'
+    '<xs:restriction base="xs:string"/></xs:simpleType>'
+)
+
+SIZE_TYPE = (
+    '<xs:simpleType name="SizeType">'
+    '<xs:restriction base="xs:integer"/></xs:simpleType>'
+)
+
+
+def _schema(root_name, *definitions):
+    """Parse a schema with a root element of type SourceType.
+
+    Args:
+        root_name:
+        *definitions:
+
+    Returns:
+
+    """
+    return etree.fromstring(
+        XSD.format(
+            f'<xs:element name="{root_name}" type="SourceType"/>'
+            + "".join(definitions)
+        )
+    )
+
+
+def _names(schema):
+    """Return the names of the global definitions of a schema.
+
+    Args:
+        schema:
+
+    Returns:
+
+    """
+    return [definition.get("name") for definition in schema]
+
+
+class TestMergeSchemas(TestCase):
+    """Test merge_schemas"""
+
+    def test_identical_definitions_are_defined_once(self):
+        """test_identical_definitions_are_defined_once
+
+        Returns:
+
+        """
+        merged = merge_schemas(
+            [
+                _schema("A", SOURCE_TYPE, INTEGER_YEAR),
+                _schema("B", SOURCE_TYPE, INTEGER_YEAR, SIZE_TYPE),
+            ]
+        )
+
+        self.assertEqual(
+            _names(merged), ["A", "SourceType", "YearType", "B", "SizeType"]
+        )
+
+    def test_different_definitions_are_renamed_with_references(self):
+        """test_different_definitions_are_renamed_with_references
+
+        Returns:
+
+        """
+        merged = merge_schemas(
+            [
+                _schema("A", SOURCE_TYPE, INTEGER_YEAR),
+                _schema("B", SOURCE_TYPE, STRING_YEAR),
+            ]
+        )
+        schema = xmlschema.XMLSchema(
+            etree.tostring(merged, encoding="unicode")
+        )
+
+        self.assertEqual(
+            _names(merged),
+            ["A", "SourceType", "YearType", "B", "SourceType_2", "YearType_2"],
+        )
+        self.assertTrue(schema.is_valid("<A><Year>2024</Year></A>"))
+        self.assertFalse(schema.is_valid("<A><Year>May</Year></A>"))
+        self.assertTrue(schema.is_valid("<B><Year>May</Year></B>"))
+
+    def test_renamed_definitions_do_not_replace_other_definitions(self):
+        """test_renamed_definitions_do_not_replace_other_definitions
+
+        Returns:
+
+        """
+        merged = merge_schemas(
+            [
+                _schema("A", SOURCE_TYPE, INTEGER_YEAR),
+                _schema(
+                    "B",
+                    SOURCE_TYPE,
+                    STRING_YEAR,
+                    SIZE_TYPE.replace("SizeType", "YearType_2"),
+                ),
+            ]
+        )
+
+        self.assertEqual(
+            _names(merged),
+            [
+                "A",
+                "SourceType",
+                "YearType",
+                "B",
+                "SourceType_2",
+                "YearType_3",
+                "YearType_2",
+            ],
+        )
+
+    def test_schemas_with_different_attributes_raise_value_error(self):
+        """test_schemas_with_different_attributes_raise_value_error
+
+        Returns:
+
+        """
+        other = _schema("B", SOURCE_TYPE, INTEGER_YEAR)
+        other.set("elementFormDefault", "qualified")
+
+        with self.assertRaises(ValueError):
+            merge_schemas([_schema("A", SOURCE_TYPE, INTEGER_YEAR), other])
+
+    def test_asphaltdb_schemas_share_common_definitions(self):
+        """test_asphaltdb_schemas_share_common_definitions
+
+        Returns:
+
+        """
+        schemas = [
+            etree.parse(path).getroot()
+            for path in xmlprocessing.get_test_schema_paths()
+        ]
+
+        merged = merge_schemas(schemas)
+
+        self.assertLess(
+            len(merged), sum(len(schema) for schema in schemas) / 2
+        )
+        self.assertEqual(
+            [
+                name
+                for name in _names(merged)
+                if name in xmlprocessing.TESTS.values()
+            ],
+            list(xmlprocessing.TEST_SCHEMA_FILES),
+        )
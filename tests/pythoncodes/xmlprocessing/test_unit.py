@@ -0,0 +1,1005 @@
+""" Test Excel to XML processing from `pythoncodes.xmlprocessing`.
+"""
+import os
+import tempfile
+from datetime import datetime
+from io import BytesIO
+from unittest.case import TestCase
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import xmlschema
+from lxml import etree
+from openpyxl import Workbook
+
+from core_curate_app.pythoncodes import xmlprocessing
+from core_curate_app.pythoncodes.mapping import MappingPlan
+
+
+class TestLoadDict(TestCase):
+    """Test load_dict and load_dict_R"""
+
+    def test_load_dict_returns_shared_mapping(self):
+        """test_load_dict_returns_shared_mapping
+
+        Returns:
+
+        """
+        self.assertIs(xmlprocessing.load_dict(), xmlprocessing.load_dict())
+        self.assertIs(xmlprocessing.load_dict_R(), xmlprocessing.load_dict_R())
+
+    def test_load_dict_returns_read_only_mapping(self):
+        """test_load_dict_returns_read_only_mapping
+
+        Returns:
+
+        """
+        mapping = xmlprocessing.load_dict()
+        column = next(iter(mapping))
+
+        with self.assertRaises(TypeError):
+            mapping[column] = ["Other"]
+        self.assertIsInstance(mapping[column], tuple)
+
+    def test_mapping_plan_is_compiled_from_mapping(self):
+        """test_mapping_plan_is_compiled_from_mapping
+
+        Returns:
+
+        """
+        plan = xmlprocessing.get_mapping_plan("AM_excel_mapping_R.pkl")
+
+        self.assertEqual(
+            [column for column, _ in plan.columns],
+            list(xmlprocessing.load_dict_R()),
+        )
+
+
+class TestProcessExcelMapped(TestCase):
+    """Test process_excel_mapped"""
+
+    def test_process_excel_mapped_matches_process_excel(self):
+        """test_process_excel_mapped_matches_process_excel
+
+        Returns:
+
+        """
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.title = "Database (Columns)"
+        for column, name in enumerate(["ID", "E", "Year", "Date", "Other"], 1):
+            sheet.cell(row=1, column=column, value=name)
+        rows = [
+            ["x", None, "units", None, "u"],
+            ["a", 1, 2001, pd.Timestamp(2020, 1, 2), 1.5],
+            ["example", 2, 2002, pd.Timestamp(2020, 1, 3), "v"],
+            ["b", 3, None, pd.Timestamp(2020, 1, 4), 2],
+            [None, 4, 2004, None, None],
+        ]
+        for row_number, row in enumerate(rows, start=10):
+            for column, value in enumerate(row, start=1):
+                sheet.cell(row=row_number, column=column, value=value)
+        file = BytesIO()
+        workbook.save(file)
+        df = xmlprocessing.process_excel(BytesIO(file.getvalue()))
+        plan = MappingPlan(
+            {df.columns[1]: ["A.Year"], df.columns[2]: ["A.Date"]}
+        )
+
+        mapped = xmlprocessing.process_excel_mapped(
+            BytesIO(file.getvalue()), plan
+        )
+
+        self.assertEqual(list(mapped.columns), list(df.columns[:3]))
+        pd.testing.assert_frame_equal(mapped, df[mapped.columns])
+
+
+class TestNormalizeColumn(TestCase):
+    """Test normalize_column"""
+
+    def _assert_matches_normalize_value(self, column, date_types):
+        """Assert normalize_column returns normalize_value of each cell.
+
+        Args:
+            column:
+            date_types:
+
+        Returns:
+
+        """
+        self.assertEqual(
+            xmlprocessing.normalize_column(column, date_types),
+            [
+                xmlprocessing.normalize_value(value, date_types)
+                for value in column
+            ],
+        )
+
+    def test_normalize_column_matches_normalize_value_for_typed_columns(
+        self,
+    ):
+        """test_normalize_column_matches_normalize_value_for_typed_columns
+
+        Returns:
+
+        """
+        columns = [
+            pd.Series([1.0, float("nan"), 2.5, -0.0, 1e20, 1e-05]),
+            pd.Series([1, -2, 3]),
+            pd.Series([True, False]),
+            pd.Series([pd.Timestamp("2020-01-02"), pd.NaT]),
+            pd.Series(["a", None, ""], dtype="str"),
+        ]
+
+        for column in columns:
+            self._assert_matches_normalize_value(column, (pd.Timestamp,))
+
+    def test_normalize_column_matches_normalize_value_for_object_columns(
+        self,
+    ):
+        """test_normalize_column_matches_normalize_value_for_object_columns
+
+        Returns:
+
+        """
+        column = pd.Series(
+            [
+                1.0,
+                None,
+                "",
+                "a",
+                pd.NaT,
+                datetime(2020, 1, 2, 3),
+                pd.Timestamp("2021-03-04"),
+                7,
+            ],
+            dtype=object,
+        )
+
+        self._assert_matches_normalize_value(column, (pd.Timestamp,))
+        self._assert_matches_normalize_value(column, (pd.Timestamp, datetime))
+
+
+class TestExtractionCacheKey(TestCase):
+    """Test extraction_cache_key"""
+
+    def test_extraction_cache_key_depends_on_content_layout_and_reader(self):
+        """test_extraction_cache_key_depends_on_content_layout_and_reader
+
+        Returns:
+
+        """
+        key = xmlprocessing.extraction_cache_key(b"workbook", "C")
+
+        self.assertEqual(
+            key, xmlprocessing.extraction_cache_key(b"workbook", "C")
+        )
+        self.assertEqual(
+            len(
+                {
+                    key,
+                    xmlprocessing.extraction_cache_key(b"other", "C"),
+                    xmlprocessing.extraction_cache_key(b"workbook", "R"),
+                    xmlprocessing.extraction_cache_key(
+                        b"workbook", "C", streaming=True
+                    ),
+                }
+            ),
+            4,
+        )
+
+    def test_extraction_cache_key_contains_mapping_version(self):
+        """test_extraction_cache_key_contains_mapping_version
+
+        Returns:
+
+        """
+        version = xmlprocessing.get_mapping_version("AM_excel_mapping_R.pkl")
+
+        self.assertIn(
+            f":{version[:16]}:",
+            xmlprocessing.extraction_cache_key(b"workbook", "R"),
+        )
+
+
+RECORD = (
+    "<AsphaltMine>"
+    "<DataSource><Year>2020</Year><DataRecord><DOI>a</DOI>"
+    "<CompleteDataRecord><Book>b</Book></CompleteDataRecord></DataRecord>"
+    "</DataSource>"
+    "<Mixture><Additive_1><Type>x\r\ny</Type></Additive_1>"
+    "<Graph><Point><Size>1; 2;3</Size><Value>5;6</Value><Unit>mm</Unit>"
+    "</Point><Point><Size>7</Size></Point></Graph></Mixture>"
+    "<Notes>first</Notes>"
+    "<RuttingTestResults><Results>r</Results><Notes>n</Notes>"
+    "</RuttingTestResults>"
+    "<ITSTestResults><Results>i</Results></ITSTestResults>"
+    "</AsphaltMine>"
+)
+
+
+class TestProcessRecord(TestCase):
+    """Test process_record"""
+
+    def test_process_record_matches_string_stages(self):
+        """test_process_record_matches_string_stages
+
+        Returns:
+
+        """
+        xml_string = xmlprocessing.remove_nmbrd_tags(RECORD)
+        xml_string = xmlprocessing.seperate_semicolons(
+            xml_string, xmlprocessing.SEMICOLON_ELEMENTS
+        )
+        xml_string = xmlprocessing.keep_only_first_child(
+            xml_string, xmlprocessing.CHOICE_ELEMENTS
+        )
+        expected = xmlprocessing.extract_single_xmls(
+            xml_string, xmlprocessing.TESTS
+        )
+
+        result = xmlprocessing.process_record(
+            xmlprocessing.ET.fromstring(RECORD.replace("\r\n", "&#13;\n"))
+        )
+
+        self.assertEqual(result, expected)
+
+    def test_process_record_extracts_one_document_per_test(self):
+        """test_process_record_extracts_one_document_per_test
+
+        Returns:
+
+        """
+        result = xmlprocessing.process_record(
+            xmlprocessing.ET.fromstring(RECORD)
+        )
+
+        self.assertEqual(len(result), 2)
+        self.assertTrue(result[0].startswith("<RuttingExp><DataSource>"))
+        self.assertTrue(result[1].endswith("</ITSTestResults></ITSExp>"))
+
+
+class TestExtractRecord(TestCase):
+    """Test extract_record"""
+
+    def setUp(self):
+        """setUp
+
+        Returns:
+
+        """
+        self.plan = MappingPlan(
+            {
+                ("Year",): ["DataSource.Year"],
+                ("Rutting",): ["RuttingTestResults.Results"],
+            }
+        )
+
+    def test_extract_record_returns_test_documents(self):
+        """test_extract_record_returns_test_documents
+
+        Returns:
+
+        """
+        result = xmlprocessing.extract_record(
+            self.plan, "AsphaltMine", ("2020", "r"), isolate_errors=True
+        )
+
+        self.assertEqual(
+            result,
+            xmlprocessing.process_record(
+                self.plan.build("AsphaltMine", ("2020", "r"))
+            ),
+        )
+
+    def test_extract_record_returns_error_of_failed_stage(self):
+        """test_extract_record_returns_error_of_failed_stage
+
+        Returns:
+
+        """
+        with patch.object(
+            xmlprocessing, "process_record", side_effect=ValueError("bad")
+        ):
+            result = xmlprocessing.extract_record(
+                self.plan, "AsphaltMine", ("2020", "r"), isolate_errors=True
+            )
+
+        self.assertIsInstance(result, xmlprocessing.RecordError)
+        self.assertEqual(result.stage, "processing")
+        self.assertEqual(result.message, "bad")
+
+    def test_extract_record_returns_error_of_invalid_xml_character(self):
+        """test_extract_record_returns_error_of_invalid_xml_character
+
+        Returns:
+
+        """
+        result = xmlprocessing.extract_record(
+            self.plan, "AsphaltMine", ("2020", "r\x0b"), isolate_errors=True
+        )
+
+        self.assertEqual(result.stage, "serializing")
+        self.assertIn("U+000B", result.message)
+        self.assertIn("'Results'", result.message)
+
+    def test_extract_record_without_isolation_raises_error(self):
+        """test_extract_record_without_isolation_raises_error
+
+        Returns:
+
+        """
+        with self.assertRaises(ValueError):
+            xmlprocessing.extract_record(
+                self.plan, "AsphaltMine", ("2020", "r\x0b")
+            )
+
+
+class TestIterXmlRecordsErrors(TestCase):
+    """Test iter_xml_records with an errors list"""
+
+    def test_failed_records_are_listed_with_their_row(self):
+        """test_failed_records_are_listed_with_their_row
+
+        Returns:
+
+        """
+        plan = MappingPlan({("Year",): ["DataSource.Year"]})
+        df = pd.DataFrame(
+            {("Year",): ["2020", "2021\x0b", "2022"]}, index=[2, 3, 4]
+        )
+        errors = []
+
+        with patch.object(
+            xmlprocessing, "get_mapping_plan", return_value=plan
+        ), patch.object(
+            xmlprocessing, "process_excel_mapped", return_value=df
+        ), patch.object(
+            xmlprocessing,
+            "process_record",
+            side_effect=lambda root: [_tostring(root)],
+        ):
+            names = [
+                name
+                for name, _ in xmlprocessing.iter_xml_final(
+                    None, "C", errors=errors
+                )
+            ]
+
+        self.assertEqual(
+            names, ["Row 12 - AsphaltMine", "Row 14 - AsphaltMine"]
+        )
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(errors[0]["row"], 13)
+        self.assertEqual(errors[0]["stage"], "serializing")
+
+    def test_record_location_returns_excel_coordinates(self):
+        """test_record_location_returns_excel_coordinates
+
+        Returns:
+
+        """
+        self.assertEqual(xmlprocessing.record_location("C", 2), {"row": 12})
+        self.assertEqual(
+            xmlprocessing.record_location("R", 2), {"column": "L"}
+        )
+
+
+class TestExtractIncremental(TestCase):
+    """Test extract_incremental"""
+
+    def setUp(self):
+        """setUp
+
+        Returns:
+
+        """
+        self.plan = MappingPlan(
+            {
+                ("Year",): ["DataSource.Year"],
+                ("Rutting",): ["RuttingTestResults.Results"],
+            }
+        )
+
+    def _extract(self, texts_rows, previous=None):
+        """Extract records from rows of texts, counting the extracted rows.
+
+        Args:
+            texts_rows:
+            previous:
+
+        Returns:
+
+        """
+        located_texts = [
+            ({"row": 12 + index}, texts)
+            for index, texts in enumerate(texts_rows)
+        ]
+        with patch.object(
+            xmlprocessing,
+            "read_located_texts",
+            return_value=(self.plan, iter(located_texts)),
+        ), patch.object(
+            xmlprocessing,
+            "extract_record",
+            wraps=xmlprocessing.extract_record,
+        ) as mock_extract_record:
+            result = xmlprocessing.extract_incremental(
+                None, "C", previous, errors=[]
+            )
+        self.extracted = mock_extract_record.call_count
+        return result
+
+    def test_first_extraction_returns_new_records(self):
+        """test_first_extraction_returns_new_records
+
+        Returns:
+
+        """
+        records, changes, _ = self._extract([("2020", "a"), ("2021", "b")])
+
+        self.assertEqual(
+            list(records), ["Row 12 - Rutting", "Row 13 - Rutting"]
+        )
+        self.assertEqual(changes["new"], list(records))
+        self.assertEqual(self.extracted, 2)
+
+    def test_only_new_and_changed_records_are_extracted(self):
+        """test_only_new_and_changed_records_are_extracted
+
+        Returns:
+
+        """
+        _, _, state = self._extract(
+            [("2020", "a"), ("2021", "b"), ("2022", "c")]
+        )
+
+        records, changes, _ = self._extract(
+            [("2020", "a"), ("2021", "B"), ("2022", "c")], state
+        )
+
+        self.assertEqual(self.extracted, 1)
+        self.assertEqual(changes["changed"], ["Row 13 - Rutting"])
+        self.assertEqual(
+            changes["unchanged"], ["Row 12 - Rutting", "Row 14 - Rutting"]
+        )
+        self.assertIn(">B<", records["Row 13 - Rutting"])
+
+    def test_moved_records_are_not_extracted_again(self):
+        """test_moved_records_are_not_extracted_again
+
+        Returns:
+
+        """
+        _, _, state = self._extract([("2020", "a"), ("2021", "b")])
+
+        _, changes, _ = self._extract([("2021", "b")], state)
+
+        self.assertEqual(self.extracted, 0)
+        self.assertEqual(changes["changed"], ["Row 12 - Rutting"])
+        self.assertEqual(changes["removed"], ["Row 13 - Rutting"])
+
+    def test_previous_extraction_of_other_version_is_ignored(self):
+        """test_previous_extraction_of_other_version_is_ignored
+
+        Returns:
+
+        """
+        _, _, state = self._extract([("2020", "a")])
+        state["version"] = "other"
+
+        _, changes, _ = self._extract([("2020", "a")], state)
+
+        self.assertEqual(self.extracted, 1)
+        self.assertEqual(changes["new"], ["Row 12 - Rutting"])
+        self.assertEqual(changes["removed"], [])
+
+
+def _tostring(root):
+    """Serialize an element tree as a string.
+
+    Args:
+        root:
+
+    Returns:
+
+    """
+    return xmlprocessing.ET.tostring(root, encoding="unicode")
+
+
+class TestSeperateSemicolons(TestCase):
+    """Test seperate_semicolons"""
+
+    def test_seperate_semicolons_splits_values_into_elements(self):
+        """test_seperate_semicolons_splits_values_into_elements
+
+        Returns:
+
+        """
+        result = xmlprocessing.seperate_semicolons(
+            "<G><Point><Size>1; 2;3</Size><Value>5;6</Value><Unit>mm</Unit>"
+            "</Point><Other>a;b</Other></G>",
+            ["Point"],
+        )
+
+        self.assertEqual(
+            result,
+            "<G><Point><Size>1</Size><Value>5</Value></Point>"
+            "<Point><Size>2</Size><Value>6</Value></Point>"
+            "<Other>a;b</Other></G>",
+        )
+
+    def test_seperate_semicolons_keeps_elements_without_semicolons(self):
+        """test_seperate_semicolons_keeps_elements_without_semicolons
+
+        Returns:
+
+        """
+        xml_string = "<G><Case><Name>a</Name></Case></G>"
+
+        self.assertEqual(
+            xmlprocessing.seperate_semicolons(xml_string, ["Case"]),
+            xml_string,
+        )
+
+    def test_seperate_semicolons_splits_nested_values(self):
+        """test_seperate_semicolons_splits_nested_values
+
+        Returns:
+
+        """
+        result = xmlprocessing.seperate_semicolons(
+            "<G><Case><Value><Number>1;2</Number><Unit>mm</Unit></Value>"
+            "<Name>a;b</Name></Case></G>",
+            ["Case"],
+        )
+
+        self.assertEqual(
+            result,
+            "<G><Case><Value><Number>1</Number></Value><Name>a</Name></Case>"
+            "<Case><Value><Number>2</Number></Value><Name>b</Name></Case></G>",
+        )
+
+    def test_seperate_semicolons_does_not_split_escaped_characters(self):
+        """test_seperate_semicolons_does_not_split_escaped_characters
+
+        Returns:
+
+        """
+        result = xmlprocessing.seperate_semicolons(
+            "<G><Point><Name>a &amp; b;c</Name></Point></G>", ["Point"]
+        )
+
+        self.assertEqual(
+            result,
+            "<G><Point><Name>a &amp; b</Name></Point>"
+            "<Point><Name>c</Name></Point></G>",
+        )
+
+
+class TestExtractSingleXmls(TestCase):
+    """Test extract_single_xmls"""
+
+    def test_extract_single_xmls_shares_datasource_and_mixture(self):
+        """test_extract_single_xmls_shares_datasource_and_mixture
+
+        Returns:
+
+        """
+        result = xmlprocessing.extract_single_xmls(
+            "<R><DataSource><Year>1</Year></DataSource><Mixture><Type>a</Type>"
+            "</Mixture><ITSTestResults><I>1</I></ITSTestResults>"
+            "<UTSTestResults><U>2</U></UTSTestResults></R>",
+            xmlprocessing.TESTS,
+        )
+
+        self.assertEqual(
+            result,
+            [
+                "<ITSExp><DataSource><Year>1</Year></DataSource><Mixture>"
+                "<Type>a</Type></Mixture><ITSTestResults><I>1</I>"
+                "</ITSTestResults></ITSExp>",
+                "<UTSTExp><DataSource><Year>1</Year></DataSource><Mixture>"
+                "<Type>a</Type></Mixture><UTSTestResults><U>2</U>"
+                "</UTSTestResults></UTSTExp>",
+            ],
+        )
+
+    def test_extract_single_xmls_adds_first_notes_after_results(self):
+        """test_extract_single_xmls_adds_first_notes_after_results
+
+        Returns:
+
+        """
+        result = xmlprocessing.extract_single_xmls(
+            "<R><Notes>0</Notes><ITSTestResults><Notes>1</Notes>"
+            "</ITSTestResults><UTSTestResults><U>2</U><Notes>2</Notes>"
+            "</UTSTestResults><Notes>3</Notes></R>",
+            xmlprocessing.TESTS,
+        )
+
+        self.assertEqual(
+            result,
+            [
+                "<ITSExp><ITSTestResults><Notes>1</Notes></ITSTestResults>"
+                "<Notes>2</Notes></ITSExp>",
+                "<UTSTExp><UTSTestResults><U>2</U><Notes>2</Notes>"
+                "</UTSTestResults><Notes>3</Notes></UTSTExp>",
+            ],
+        )
+
+    def test_extract_single_xmls_returns_empty_list_without_results(self):
+        """test_extract_single_xmls_returns_empty_list_without_results
+
+        Returns:
+
+        """
+        self.assertEqual(
+            xmlprocessing.extract_single_xmls(
+                "<R><DataSource><Year>1</Year></DataSource></R>",
+                xmlprocessing.TESTS,
+            ),
+            [],
+        )
+
+
+class TestIterNames(TestCase):
+    """Test iter_names and add_names"""
+
+    def test_iter_names_names_documents_by_row_and_column(self):
+        """test_iter_names_names_documents_by_row_and_column
+
+        Returns:
+
+        """
+        records = [["<RuttingExp/>", "<ITSExp/>"], [], ["<UTSTExp/>"]]
+
+        self.assertEqual(
+            list(xmlprocessing.iter_names(records, "C")),
+            [
+                ("Row 12 - Rutting", "<RuttingExp/>"),
+                ("Row 12 - ITS", "<ITSExp/>"),
+                ("Row 14 - UTST", "<UTSTExp/>"),
+            ],
+        )
+        self.assertEqual(
+            list(xmlprocessing.add_names(records, "R")),
+            ["Column 'L' - Rutting", "Column 'L' - ITS", "Column 'N' - UTST"],
+        )
+
+    def test_iter_names_reads_root_tag_without_parsing_documents(self):
+        """test_iter_names_reads_root_tag_without_parsing_documents
+
+        Returns:
+
+        """
+        records = [["<MarshallExp><DataSource /></MarshallExp>"]]
+
+        with patch.object(
+            xmlprocessing.etree, "XML", side_effect=AssertionError
+        ):
+            names = list(xmlprocessing.add_names(records, "C"))
+
+        self.assertEqual(names, ["Row 12 - Marshall"])
+
+    def test_iter_names_with_unknown_excel_type_raises_value_error(self):
+        """test_iter_names_with_unknown_excel_type_raises_value_error
+
+        Returns:
+
+        """
+        with self.assertRaises(ValueError):
+            list(xmlprocessing.iter_names([], "X"))
+
+        self.assertIsInstance(xmlprocessing.add_names([], "X"), str)
+
+
+class TestProcessRecordsParallel(TestCase):
+    """Test process_records_parallel"""
+
+    def setUp(self):
+        """setUp
+
+        Returns:
+
+        """
+        self.plan = MappingPlan(
+            {
+                ("Year",): ["DataSource.Year"],
+                ("Rutting",): ["RuttingTestResults.Results"],
+                ("ITS",): ["ITSTestResults.Results"],
+            }
+        )
+        self.texts_rows = [
+            (str(year), "r" if year % 2 else None, "i" if year % 3 else None)
+            for year in range(2000, 2007)
+        ]
+
+    def test_process_records_parallel_matches_serial_processing_in_order(
+        self,
+    ):
+        """test_process_records_parallel_matches_serial_processing_in_order
+
+        Returns:
+
+        """
+        results = list(
+            xmlprocessing.process_records_parallel(
+                iter(self.texts_rows), self.plan, "AsphaltMine", 2, 2
+            )
+        )
+
+        self.assertEqual(
+            results,
+            [
+                xmlprocessing.process_record(
+                    self.plan.build("AsphaltMine", texts)
+                )
+                for texts in self.texts_rows
+            ],
+        )
+
+    def test_process_records_parallel_returns_errors_of_failed_records(self):
+        """test_process_records_parallel_returns_errors_of_failed_records
+
+        Returns:
+
+        """
+        texts_rows = [("2000", "r\x0b", None), ("2001", "r", None)]
+
+        results = list(
+            xmlprocessing.process_records_parallel(
+                iter(texts_rows), self.plan, "AsphaltMine", 2, 1, True
+            )
+        )
+
+        self.assertIsInstance(results[0], xmlprocessing.RecordError)
+        self.assertEqual(results[0].stage, "serializing")
+        self.assertEqual(
+            results[1],
+            xmlprocessing.process_record(
+                self.plan.build("AsphaltMine", texts_rows[1])
+            ),
+        )
+
+    @patch.object(xmlprocessing, "_extraction_pool", None)
+    @patch.object(xmlprocessing, "ProcessPoolExecutor")
+    def test_extraction_pool_is_shared_and_started_by_fork_server(
+        self, mock_process_pool_executor
+    ):
+        """test_extraction_pool_is_shared_and_started_by_fork_server
+
+        Returns:
+
+        """
+        pools = [xmlprocessing.get_extraction_pool(2) for _ in range(2)]
+
+        self.assertIs(pools[0], pools[1])
+        mock_process_pool_executor.assert_called_once()
+        self.assertEqual(
+            mock_process_pool_executor.call_args.kwargs[
+                "mp_context"
+            ].get_start_method(),
+            "forkserver",
+        )
+
+        xmlprocessing.get_extraction_pool(3)
+
+        self.assertEqual(mock_process_pool_executor.call_count, 2)
+        pools[0].shutdown.assert_called_once_with(wait=False)
+
+    def test_process_records_parallel_returns_empty_list_without_rows(self):
+        """test_process_records_parallel_returns_empty_list_without_rows
+
+        Returns:
+
+        """
+        self.assertEqual(
+            list(
+                xmlprocessing.process_records_parallel(
+                    [], self.plan, "AsphaltMine", 2, 2
+                )
+            ),
+            [],
+        )
+
+
+VALID_MARSHALL = (
+    "<MarshallExp><DataSource><MeasurementCampaignID>x</MeasurementCampaignID>"
+    "<OrganizationName>x</OrganizationName><LocationCountry>x</LocationCountry>"
+    "<Year>2020</Year></DataSource><Mixture /><MarshallTestResults>"
+    "<MarshallResults><Stability>1.5</Stability><Flow>1.5</Flow>"
+    "</MarshallResults></MarshallTestResults></MarshallExp>"
+)
+
+SCHEMA = (
+    '<xs:schema xmlns:xs="http://www.w3.org/2001/XMLSchema">'
+    '<xs:element name="tag" type="xs:integer"/></xs:schema>'
+)
+
+
+class TestValidateRecord(TestCase):
+    """Test validate_record"""
+
+    def setUp(self):
+        """setUp
+
+        Returns:
+
+        """
+        self.schema, self.fast_schema = xmlprocessing.compile_schemas(SCHEMA)
+
+    def test_compile_schemas_returns_xmlschema_and_lxml_schemas(self):
+        """test_compile_schemas_returns_xmlschema_and_lxml_schemas
+
+        Returns:
+
+        """
+        self.assertIsInstance(self.schema, xmlschema.XMLSchema)
+        self.assertIsInstance(self.fast_schema, etree.XMLSchema)
+
+    def test_compile_fast_schema_returns_none_if_lxml_cannot_compile(self):
+        """test_compile_fast_schema_returns_none_if_lxml_cannot_compile
+
+        Returns:
+
+        """
+        self.assertIsNone(
+            xmlprocessing.compile_fast_schema(etree.fromstring("<tag/>"))
+        )
+
+    def test_valid_record_is_not_validated_by_xmlschema(self):
+        """test_valid_record_is_not_validated_by_xmlschema
+
+        Returns:
+
+        """
+        schema = MagicMock()
+
+        self.assertEqual(
+            xmlprocessing.validate_record(
+                "<tag>1</tag>", schema, self.fast_schema
+            ),
+            "VALID",
+        )
+        schema.validate.assert_not_called()
+
+    def test_invalid_record_is_explained_by_xmlschema(self):
+        """test_invalid_record_is_explained_by_xmlschema
+
+        Returns:
+
+        """
+        result = xmlprocessing.validate_record(
+            "<tag>a</tag>", self.schema, self.fast_schema
+        )
+
+        self.assertTrue(result.startswith("INVALID"))
+        self.assertEqual(
+            result, xmlprocessing.validate_record("<tag>a</tag>", self.schema)
+        )
+
+
+class TestSchemaDiskCache(TestCase):
+    """Test compile_xmlschema with the schema disk cache"""
+
+    def setUp(self):
+        """setUp
+
+        Returns:
+
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.addCleanup(xmlprocessing.configure_schema_disk_cache, None)
+        xmlprocessing.configure_schema_disk_cache(self.directory.name)
+
+    def test_compiled_schema_is_loaded_from_disk(self):
+        """test_compiled_schema_is_loaded_from_disk
+
+        Returns:
+
+        """
+        xmlprocessing.compile_xmlschema(SCHEMA, SCHEMA)
+        xmlprocessing.configure_schema_disk_cache(self.directory.name)
+
+        with patch.object(
+            xmlprocessing.xmlschema, "XMLSchema"
+        ) as mock_xmlschema:
+            schema, _ = xmlprocessing.compile_schemas(SCHEMA)
+
+        mock_xmlschema.assert_not_called()
+        self.assertTrue(schema.is_valid("<tag>1</tag>"))
+        self.assertFalse(schema.is_valid("<tag>a</tag>"))
+
+    def test_test_schema_is_stored_on_disk(self):
+        """test_test_schema_is_stored_on_disk
+
+        Returns:
+
+        """
+        file_path = os.path.join(self.directory.name, "test.xsd")
+        with open(file_path, "w") as file:
+            file.write(SCHEMA)
+
+        schema = xmlprocessing.load_test_schema(file_path)
+
+        self.assertIsInstance(schema, xmlschema.XMLSchema)
+        self.assertEqual(
+            len(
+                [
+                    name
+                    for name in os.listdir(self.directory.name)
+                    if name.endswith(".pickle")
+                ]
+            ),
+            1,
+        )
+
+    def test_schemas_are_compiled_without_disk_cache(self):
+        """test_schemas_are_compiled_without_disk_cache
+
+        Returns:
+
+        """
+        xmlprocessing.configure_schema_disk_cache(None)
+
+        self.assertIsNone(xmlprocessing.schema_disk_cache)
+        self.assertIsInstance(
+            xmlprocessing.compile_xmlschema(SCHEMA, SCHEMA),
+            xmlschema.XMLSchema,
+        )
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+
+class TestValidateTestDocument(TestCase):
+    """Test validate_test_document"""
+
+    def test_validate_test_document_returns_valid_for_valid_document(self):
+        """test_validate_test_document_returns_valid_for_valid_document
+
+        Returns:
+
+        """
+        self.assertEqual(
+            xmlprocessing.validate_test_document(VALID_MARSHALL), "VALID"
+        )
+
+    def test_validate_test_document_uses_schema_of_document_root(self):
+        """test_validate_test_document_uses_schema_of_document_root
+
+        Returns:
+
+        """
+        result = xmlprocessing.validate_test_document("<RuttingExp/>")
+
+        self.assertTrue(result.startswith("INVALID"))
+        self.assertEqual(
+            result,
+            xmlprocessing.validate_record(
+                "<RuttingExp/>", xmlprocessing.get_test_schema("RuttingExp")
+            ),
+        )
+
+    def test_validate_test_document_without_schema_returns_invalid(self):
+        """test_validate_test_document_without_schema_returns_invalid
+
+        Returns:
+
+        """
+        self.assertEqual(
+            xmlprocessing.validate_test_document("<Other/>"),
+            "INVALID: No schema for test document 'Other'",
+        )
+
+    def test_validate_test_document_with_syntax_error_returns_invalid(self):
+        """test_validate_test_document_with_syntax_error_returns_invalid
+
+        Returns:
+
+        """
+        self.assertTrue(
+            xmlprocessing.validate_test_document("<Other>").startswith(
+                "INVALID: XML syntax error"
+            )
+        )
@@ -4,15 +4,21 @@ import json
 from unittest import TestCase
 from unittest.mock import patch, Mock, MagicMock
 
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.http import HttpResponseBadRequest
 from django.test import RequestFactory
 
 from core_curate_app.components.curate_data_structure.models import (
     CurateDataStructure,
 )
+from core_curate_app.pythoncodes.cache import ContentCache
+from core_curate_app.pythoncodes.jobs import Job
+from core_curate_app.pythoncodes.xmlprocessing import compile_schemas
 from core_curate_app.views.user import ajax as curate_user_ajax
 from core_curate_app.views.user import views as curate_user_views
 from core_main_app.commons.exceptions import DoesNotExist, JSONError
+from core_main_app.components.data.models import Data
 from core_main_app.components.template.models import Template
 from core_main_app.utils.tests_tools.MockUser import create_mock_user
 
@@ -965,6 +971,900 @@ class TestStartCuratePostView(TestCase):
         self.assertEqual(response.status_code, 200)
 
 
+class TestExtractXmlView(TestCase):
+    """Unit tests for `extractxml` method."""
+
+    def setUp(self):
+        """setUp"""
+        self.factory = RequestFactory()
+        self.user = create_mock_user(user_id="1", has_perm=True)
+
+    def _post(self, data):
+        """Build an extractxml request uploading a workbook
+
+        Args:
+            data:
+
+        Returns:
+
+        """
+        request = self.factory.post(
+            "core_curate_extract_xml",
+            dict(data, excelFile=SimpleUploadedFile("a.xlsx", b"workbook")),
+        )
+        request.user = self.user
+        return request
+
+    @patch.object(curate_user_ajax, "extraction_jobs")
+    def test_extractxml_async_submits_job_and_returns_job_id(
+        self, mock_extraction_jobs
+    ):
+        """test_extractxml_async_submits_job_and_returns_job_id"""
+        mock_extraction_jobs.submit.return_value = Job(owner=self.user.id)
+
+        response = curate_user_ajax.extractxml(
+            self._post({"sheet": "Columns", "async": "true"})
+        )
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(
+            json.loads(response.content),
+            {"job_id": mock_extraction_jobs.submit.return_value.id},
+        )
+        mock_extraction_jobs.submit.assert_called_with(
+            curate_user_ajax._extract_xml,
+            b"workbook",
+            "C",
+            False,
+            owner=self.user.id,
+        )
+
+    @patch.object(curate_user_ajax, "process_xml_final_R")
+    def test_extractxml_returns_records_of_rows_sheet(
+        self, mock_process_xml_final_r
+    ):
+        """test_extractxml_returns_records_of_rows_sheet"""
+        mock_process_xml_final_r.return_value = {"Column 'L' - A": "<A/>"}
+
+        response = curate_user_ajax.extractxml(self._post({"sheet": "Rows"}))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            json.loads(response.content),
+            {"records": {"Column 'L' - A": "<A/>"}, "errors": []},
+        )
+
+    @patch.object(curate_user_ajax, "iter_xml_final")
+    def test_extractxml_ndjson_streams_one_line_per_record(
+        self, mock_iter_xml_final
+    ):
+        """test_extractxml_ndjson_streams_one_line_per_record"""
+        mock_iter_xml_final.return_value = iter(
+            [
+                ("Row 12 - Rutting", "<RuttingExp/>"),
+                ("Row 13 - ITS", "<ITSExp/>"),
+            ]
+        )
+
+        response = curate_user_ajax.extractxml(
+            self._post({"sheet": "Columns", "format": "ndjson"})
+        )
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            [
+                json.loads(line)
+                for line in b"".join(response.streaming_content).splitlines()
+            ],
+            [
+                {"name": "Row 12 - Rutting", "xml": "<RuttingExp/>"},
+                {"name": "Row 13 - ITS", "xml": "<ITSExp/>"},
+            ],
+        )
+        self.assertEqual(mock_iter_xml_final.call_args[0][1], "C")
+
+    @patch.object(curate_user_ajax, "iter_xml_final")
+    def test_extractxml_ndjson_ends_with_error_line_when_extraction_fails(
+        self, mock_iter_xml_final
+    ):
+        """test_extractxml_ndjson_ends_with_error_line_when_extraction_fails"""
+
+        def named_records():
+            yield "Column 'L' - Rutting", "<RuttingExp/>"
+            raise ValueError("bad cell")
+
+        mock_iter_xml_final.return_value = named_records()
+
+        response = curate_user_ajax.extractxml(
+            self._post({"sheet": "Rows", "format": "ndjson"})
+        )
+
+        lines = b"".join(response.streaming_content).splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertEqual(json.loads(lines[1]), {"error": "bad cell"})
+        self.assertEqual(mock_iter_xml_final.call_args[0][1], "R")
+
+    @patch.object(curate_user_ajax, "process_xml_final")
+    def test_extractxml_returns_records_and_errors_of_failed_records(
+        self, mock_process_xml_final
+    ):
+        """test_extractxml_returns_records_and_errors_of_failed_records"""
+
+        def process(excel, errors, **options):
+            errors.append({"row": 13, "stage": "building", "error": "bad"})
+            return {"Row 12 - A": "<A/>"}
+
+        mock_process_xml_final.side_effect = process
+
+        response = curate_user_ajax.extractxml(
+            self._post({"sheet": "Columns"})
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "records": {"Row 12 - A": "<A/>"},
+                "errors": [{"row": 13, "stage": "building", "error": "bad"}],
+            },
+        )
+
+    @patch.object(curate_user_ajax, "iter_xml_final")
+    def test_extractxml_ndjson_streams_error_lines_of_failed_records(
+        self, mock_iter_xml_final
+    ):
+        """test_extractxml_ndjson_streams_error_lines_of_failed_records"""
+
+        def named_records(excel, excel_type, errors, **options):
+            yield "Row 12 - A", "<A/>"
+            errors.append({"row": 13, "stage": "building", "error": "bad"})
+            yield "Row 14 - A", "<A/>"
+            errors.append({"row": 15, "stage": "processing", "error": "bad"})
+
+        mock_iter_xml_final.side_effect = named_records
+
+        response = curate_user_ajax.extractxml(
+            self._post({"sheet": "Columns", "format": "ndjson"})
+        )
+
+        self.assertEqual(
+            [
+                json.loads(line)
+                for line in b"".join(response.streaming_content).splitlines()
+            ],
+            [
+                {"name": "Row 12 - A", "xml": "<A/>"},
+                {"row": 13, "stage": "building", "error": "bad"},
+                {"name": "Row 14 - A", "xml": "<A/>"},
+                {"row": 15, "stage": "processing", "error": "bad"},
+            ],
+        )
+
+    @patch.object(curate_user_ajax, "CURATE_EXCEL_RESULT_CACHE", "default")
+    @patch.object(curate_user_ajax, "process_xml_final")
+    def test_extractxml_returns_cached_records_of_same_workbook(
+        self, mock_process_xml_final
+    ):
+        """test_extractxml_returns_cached_records_of_same_workbook"""
+        caches["default"].clear()
+        mock_process_xml_final.return_value = {"Row 12 - A": "<A/>"}
+
+        responses = [
+            curate_user_ajax.extractxml(self._post({"sheet": "Columns"}))
+            for _ in range(2)
+        ]
+
+        self.assertEqual(mock_process_xml_final.call_count, 1)
+        for response in responses:
+            self.assertEqual(
+                json.loads(response.content),
+                {"records": {"Row 12 - A": "<A/>"}, "errors": []},
+            )
+
+    @patch.object(curate_user_ajax, "CURATE_EXCEL_LINEAGE_CACHE", "default")
+    @patch.object(curate_user_ajax, "validate_test_document")
+    @patch.object(curate_user_ajax, "extract_incremental")
+    def test_extractxml_of_same_lineage_only_validates_changed_records(
+        self, mock_extract_incremental, mock_validate_test_document
+    ):
+        """test_extractxml_of_same_lineage_only_validates_changed_records"""
+        caches["default"].clear()
+
+        def extract(excel, excel_type, previous, *args):
+            status = "new" if previous is None else "unchanged"
+            changes = {
+                "new": [],
+                "changed": [],
+                "removed": [],
+                "unchanged": [],
+            }
+            changes[status].append("Row 12 - A")
+            return {"Row 12 - A": "<A/>"}, changes, {"version": "1"}
+
+        mock_extract_incremental.side_effect = extract
+        mock_validate_test_document.return_value = {"status": "VALID"}
+
+        responses = [
+            curate_user_ajax.extractxml(
+                self._post({"sheet": "Columns", "validate": "true"})
+            )
+            for _ in range(2)
+        ]
+
+        self.assertEqual(mock_validate_test_document.call_count, 1)
+        self.assertEqual(
+            json.loads(responses[1].content),
+            {
+                "records": {
+                    "Row 12 - A": {
+                        "xml": "<A/>",
+                        "validation": {"status": "VALID"},
+                    },
+                },
+                "errors": [],
+                "changes": {
+                    "new": [],
+                    "changed": [],
+                    "removed": [],
+                    "unchanged": ["Row 12 - A"],
+                },
+            },
+        )
+
+    @patch.object(curate_user_ajax, "CURATE_EXCEL_LINEAGE_CACHE", "default")
+    @patch.object(curate_user_ajax, "get_test_schema_version")
+    @patch.object(curate_user_ajax, "validate_test_document")
+    @patch.object(curate_user_ajax, "extract_incremental")
+    def test_extractxml_of_same_lineage_revalidates_after_schema_update(
+        self,
+        mock_extract_incremental,
+        mock_validate_test_document,
+        mock_get_test_schema_version,
+    ):
+        """test_extractxml_of_same_lineage_revalidates_after_schema_update"""
+        caches["default"].clear()
+
+        def extract(excel, excel_type, previous, *args):
+            status = "new" if previous is None else "unchanged"
+            changes = {
+                "new": [],
+                "changed": [],
+                "removed": [],
+                "unchanged": [],
+            }
+            changes[status].append("Row 12 - A")
+            return {"Row 12 - A": "<A/>"}, changes, {"version": "1"}
+
+        mock_extract_incremental.side_effect = extract
+        mock_get_test_schema_version.side_effect = ["v1", "v2", "v2"]
+        mock_validate_test_document.side_effect = [
+            {"status": "VALID"},
+            {"status": "INVALID"},
+        ]
+
+        responses = [
+            curate_user_ajax.extractxml(
+                self._post({"sheet": "Columns", "validate": "true"})
+            )
+            for _ in range(3)
+        ]
+
+        self.assertEqual(mock_validate_test_document.call_count, 2)
+        self.assertEqual(
+            [
+                json.loads(response.content)["records"]["Row 12 - A"][
+                    "validation"
+                ]
+                for response in responses
+            ],
+            [
+                {"status": "VALID"},
+                {"status": "INVALID"},
+                {"status": "INVALID"},
+            ],
+        )
+
+    @patch.object(curate_user_ajax, "CURATE_EXCEL_RESULT_CACHE", "default")
+    @patch.object(curate_user_ajax, "iter_xml_final")
+    def test_extractxml_ndjson_caches_streamed_records(
+        self, mock_iter_xml_final
+    ):
+        """test_extractxml_ndjson_caches_streamed_records"""
+        caches["default"].clear()
+        mock_iter_xml_final.side_effect = lambda *args, **kwargs: iter(
+            [("Row 12 - A", "<A/>")]
+        )
+
+        contents = [
+            b"".join(
+                curate_user_ajax.extractxml(
+                    self._post({"sheet": "Columns", "format": "ndjson"})
+                ).streaming_content
+            )
+            for _ in range(2)
+        ]
+
+        self.assertEqual(contents[0], contents[1])
+        self.assertEqual(
+            json.loads(contents[0]), {"name": "Row 12 - A", "xml": "<A/>"}
+        )
+        self.assertEqual(mock_iter_xml_final.call_count, 1)
+
+    @patch.object(curate_user_ajax, "validate_test_document")
+    @patch.object(curate_user_ajax, "process_xml_final")
+    def test_extractxml_with_validate_returns_records_with_validation(
+        self, mock_process_xml_final, mock_validate_test_document
+    ):
+        """test_extractxml_with_validate_returns_records_with_validation"""
+        mock_process_xml_final.return_value = {
+            "Row 12 - Rutting": "<RuttingExp/>"
+        }
+        mock_validate_test_document.return_value = "VALID"
+
+        response = curate_user_ajax.extractxml(
+            self._post({"sheet": "Columns", "validate": "true"})
+        )
+
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "records": {
+                    "Row 12 - Rutting": {
+                        "xml": "<RuttingExp/>",
+                        "validation": "VALID",
+                    }
+                },
+                "errors": [],
+            },
+        )
+        mock_validate_test_document.assert_called_with("<RuttingExp/>")
+
+    @patch.object(curate_user_ajax, "validate_test_document")
+    @patch.object(curate_user_ajax, "iter_xml_final")
+    def test_extractxml_ndjson_with_validate_adds_validation_to_lines(
+        self, mock_iter_xml_final, mock_validate_test_document
+    ):
+        """test_extractxml_ndjson_with_validate_adds_validation_to_lines"""
+        mock_iter_xml_final.return_value = iter(
+            [("Row 12 - Rutting", "<RuttingExp/>")]
+        )
+        mock_validate_test_document.return_value = "INVALID: Missing field"
+
+        response = curate_user_ajax.extractxml(
+            self._post(
+                {"sheet": "Columns", "format": "ndjson", "validate": "true"}
+            )
+        )
+
+        self.assertEqual(
+            json.loads(b"".join(response.streaming_content)),
+            {
+                "name": "Row 12 - Rutting",
+                "xml": "<RuttingExp/>",
+                "validation": "INVALID: Missing field",
+            },
+        )
+
+    def test_extractxml_with_unknown_sheet_returns_http_400(self):
+        """test_extractxml_with_unknown_sheet_returns_http_400"""
+        response = curate_user_ajax.extractxml(
+            self._post({"sheet": "Other", "async": "true"})
+        )
+
+        self.assertEqual(response.status_code, 400)
+
+
+class TestExtractXmlJobView(TestCase):
+    """Unit tests for `extractxml_job` method."""
+
+    def setUp(self):
+        """setUp"""
+        self.request = RequestFactory().get("core_curate_extract_xml_job")
+        self.request.user = create_mock_user(user_id="1", has_perm=True)
+
+    @patch.object(curate_user_ajax, "extraction_jobs")
+    def test_extractxml_job_returns_job_status(self, mock_extraction_jobs):
+        """test_extractxml_job_returns_job_status"""
+        job = Job(owner=self.request.user.id)
+        job.report("extracting", 5, 10)
+        mock_extraction_jobs.get.return_value = job
+
+        response = curate_user_ajax.extractxml_job(self.request, job.id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content), job.to_dict())
+        mock_extraction_jobs.get.assert_called_with(job.id)
+
+    @patch.object(curate_user_ajax, "extraction_jobs")
+    def test_extractxml_job_of_other_user_returns_http_404(
+        self, mock_extraction_jobs
+    ):
+        """test_extractxml_job_of_other_user_returns_http_404"""
+        job = Job(owner="2")
+        mock_extraction_jobs.get.return_value = job
+
+        response = curate_user_ajax.extractxml_job(self.request, job.id)
+
+        self.assertEqual(response.status_code, 404)
+
+    @patch.object(curate_user_ajax, "extraction_jobs")
+    def test_extractxml_unknown_job_returns_http_404(
+        self, mock_extraction_jobs
+    ):
+        """test_extractxml_unknown_job_returns_http_404"""
+        mock_extraction_jobs.get.return_value = None
+
+        response = curate_user_ajax.extractxml_job(self.request, "unknown")
+
+        self.assertEqual(response.status_code, 404)
+
+
+class TestValidateRecordsView(TestCase):
+    """Unit tests for `validaterecords` method."""
+
+    def setUp(self):
+        """setUp"""
+        self.factory = RequestFactory()
+        self.user = create_mock_user(user_id="1", has_perm=True)
+        self.records = [
+            {"xml_dt": "<tag>a</tag>", "template_id": "1"},
+            {"xml_dt": "<other/>", "template_id": "1"},
+            {"xml_dt": "", "template_id": "1"},
+            {"xml_dt": "<tag/>", "template_id": "2"},
+            {"xml_dt": "<tag/>"},
+            {"xml_dt": "<tag>b</tag>", "template_id": "1"},
+        ]
+
+    def _post(self, records):
+        """Build a validaterecords request
+
+        Args:
+            records:
+
+        Returns:
+
+        """
+        request = self.factory.post(
+            "core_curate_validate_records", {"records": records}
+        )
+        request.user = self.user
+        return request
+
+    def _get_template(self, template_id, request):
+        """Return the XSD template 1 and the JSON template 2
+
+        Args:
+            template_id:
+            request:
+
+        Returns:
+
+        """
+        return _get_template() if template_id == "1" else _get_json_template()
+
+    def _assert_results(self, response):
+        """Assert the results of the records are returned in order
+
+        Args:
+            response:
+
+        Returns:
+
+        """
+        results = json.loads(response.content)["results"]
+        self.assertEqual(len(results), 6)
+        self.assertEqual(results[0], {"message": "VALID"})
+        self.assertTrue(results[1]["errors"][0].startswith("INVALID"))
+        self.assertEqual(results[2], {"errors": ["Missing XML data."]})
+        self.assertEqual(
+            results[3], {"errors": ["Provided template is not an XSD format."]}
+        )
+        self.assertEqual(results[4], {"errors": ["Missing template ID."]})
+        self.assertEqual(results[5], {"message": "VALID"})
+
+    @patch.object(
+        curate_user_ajax, "schema_cache", ContentCache(compile_schemas, 4)
+    )
+    @patch("core_main_app.components.template.api.get_by_id")
+    def test_validaterecords_returns_results_in_input_order(
+        self, mock_template_get_by_id
+    ):
+        """test_validaterecords_returns_results_in_input_order"""
+        mock_template_get_by_id.side_effect = self._get_template
+
+        response = curate_user_ajax.validaterecords(
+            self._post(json.dumps(self.records))
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self._assert_results(response)
+        self.assertEqual(mock_template_get_by_id.call_count, 2)
+
+    @patch.object(curate_user_ajax, "CURATE_BATCH_VALIDATION_WORKERS", 3)
+    @patch.object(
+        curate_user_ajax, "schema_cache", ContentCache(compile_schemas, 4)
+    )
+    @patch("core_main_app.components.template.api.get_by_id")
+    def test_validaterecords_in_parallel_returns_results_in_input_order(
+        self, mock_template_get_by_id
+    ):
+        """test_validaterecords_in_parallel_returns_results_in_input_order"""
+        mock_template_get_by_id.side_effect = self._get_template
+
+        response = curate_user_ajax.validaterecords(
+            self._post(json.dumps(self.records))
+        )
+
+        self._assert_results(response)
+
+    @patch("core_main_app.components.template.api.get_by_id")
+    def test_validaterecords_with_unknown_template_returns_errors(
+        self, mock_template_get_by_id
+    ):
+        """test_validaterecords_with_unknown_template_returns_errors"""
+        mock_template_get_by_id.side_effect = DoesNotExist("not found")
+
+        response = curate_user_ajax.validaterecords(
+            self._post(json.dumps([{"xml_dt": "<tag/>", "template_id": "9"}]))
+        )
+
+        self.assertEqual(
+            json.loads(response.content),
+            {"results": [{"errors": ["Unexpected Error: not found"]}]},
+        )
+
+    def test_validaterecords_with_null_fields_returns_missing_errors(self):
+        """test_validaterecords_with_null_fields_returns_missing_errors"""
+        records = [
+            {"xml_dt": None, "template_id": "1"},
+            {"xml_dt": "<tag/>", "template_id": None},
+        ]
+
+        response = curate_user_ajax.validaterecords(
+            self._post(json.dumps(records))
+        )
+
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "results": [
+                    {"errors": ["Missing XML data."]},
+                    {"errors": ["Missing template ID."]},
+                ]
+            },
+        )
+
+    def test_validaterecords_with_invalid_records_returns_http_bad_request(
+        self,
+    ):
+        """test_validaterecords_with_invalid_records_returns_http_bad_request"""
+        for records in ["", "{}", "[1]", "not json"]:
+            response = curate_user_ajax.validaterecords(self._post(records))
+
+            self.assertIsInstance(response, HttpResponseBadRequest)
+
+
+class TestIngestXmlView(TestCase):
+    """Unit tests for `ingestxml` method."""
+
+    def setUp(self):
+        """setUp"""
+        self.factory = RequestFactory()
+        self.user = create_mock_user(user_id="1", has_perm=True)
+        self.saved = []
+
+    def _post(self, data):
+        """Build an ingestxml request uploading a workbook
+
+        Args:
+            data:
+
+        Returns:
+
+        """
+        request = self.factory.post(
+            "core_curate_ingest_xml",
+            dict(data, excelFile=SimpleUploadedFile("a.xlsx", b"workbook")),
+        )
+        request.user = self.user
+        return request
+
+    @patch.object(
+        curate_user_ajax, "schema_cache", ContentCache(compile_schemas, 4)
+    )
+    @patch.object(Data, "save_object", autospec=True)
+    @patch.object(curate_user_ajax, "data_api")
+    @patch.object(curate_user_ajax, "template_api")
+    @patch.object(curate_user_ajax, "iter_xml_final")
+    def test_ingestxml_saves_valid_records_and_returns_failures(
+        self,
+        mock_iter_xml_final,
+        mock_template_api,
+        mock_data_api,
+        mock_save_object,
+    ):
+        """test_ingestxml_saves_valid_records_and_returns_failures"""
+        mock_iter_xml_final.return_value = iter(
+            [
+                ("Row 12 - tag", "<tag/>"),
+                ("Row 13 - other", "<other/>"),
+                ("Row 14 - tag", "<tag/>"),
+            ]
+        )
+        mock_template_api.get_by_id.return_value = _get_template()
+        mock_data_api.upsert.side_effect = _mock_upsert(self.saved)
+
+        response = curate_user_ajax.ingestxml(
+            self._post({"sheet": "Columns", "template_id": "1"})
+        )
+
+        self.assertEqual(response.status_code, 200)
+        result = json.loads(response.content)
+        self.assertEqual(
+            result["saved"],
+            [
+                {"name": "Row 12 - tag", "data_id": "1"},
+                {"name": "Row 14 - tag", "data_id": "2"},
+            ],
+        )
+        self.assertEqual(len(result["failures"]), 1)
+        self.assertEqual(result["failures"][0]["name"], "Row 13 - other")
+        self.assertTrue(
+            result["failures"][0]["errors"][0].startswith("INVALID")
+        )
+        self.assertEqual(self.saved, ["Row 12 - tag", "Row 14 - tag"])
+        self.assertEqual(
+            [
+                call.args[0].file.name
+                for call in mock_save_object.call_args_list
+            ],
+            ["Row 12 - tag_AMUID1", "Row 14 - tag_AMUID2"],
+        )
+
+    @patch.object(
+        curate_user_ajax, "schema_cache", ContentCache(compile_schemas, 4)
+    )
+    @patch.object(curate_user_ajax, "data_api")
+    @patch.object(curate_user_ajax, "template_api")
+    @patch.object(curate_user_ajax, "iter_xml_final")
+    def test_ingestxml_returns_save_errors_as_failures(
+        self, mock_iter_xml_final, mock_template_api, mock_data_api
+    ):
+        """test_ingestxml_returns_save_errors_as_failures"""
+        mock_iter_xml_final.return_value = iter([("Row 12 - tag", "<tag/>")])
+        mock_template_api.get_by_id.return_value = _get_template()
+        mock_data_api.upsert.side_effect = Exception("Unable to save data")
+
+        response = curate_user_ajax.ingestxml(
+            self._post({"sheet": "Rows", "template_id": "1"})
+        )
+
+        self.assertEqual(
+            json.loads(response.content),
+            {
+                "saved": [],
+                "failures": [
+                    {"name": "Row 12 - tag", "errors": ["Unable to save data"]}
+                ],
+                "errors": [],
+            },
+        )
+        self.assertEqual(mock_iter_xml_final.call_args.args[1], "R")
+
+    @patch.object(curate_user_ajax, "extraction_jobs")
+    @patch.object(curate_user_ajax, "template_api")
+    def test_ingestxml_async_submits_job_and_returns_job_id(
+        self, mock_template_api, mock_extraction_jobs
+    ):
+        """test_ingestxml_async_submits_job_and_returns_job_id"""
+        template = _get_template()
+        mock_template_api.get_by_id.return_value = template
+        mock_extraction_jobs.submit.return_value = Job(owner=self.user.id)
+        request = self._post(
+            {"sheet": "Columns", "template_id": "1", "async": "true"}
+        )
+
+        response = curate_user_ajax.ingestxml(request)
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(
+            json.loads(response.content),
+            {"job_id": mock_extraction_jobs.submit.return_value.id},
+        )
+        mock_extraction_jobs.submit.assert_called_with(
+            curate_user_ajax._run_ingest_job,
+            b"workbook",
+            "C",
+            template,
+            request,
+            owner=self.user.id,
+        )
+
+    @patch.object(curate_user_ajax, "template_api")
+    def test_ingestxml_with_json_template_returns_400(self, mock_template_api):
+        """test_ingestxml_with_json_template_returns_400"""
+        mock_template_api.get_by_id.return_value = _get_json_template()
+
+        response = curate_user_ajax.ingestxml(
+            self._post({"sheet": "Columns", "template_id": "2"})
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            json.loads(response.content),
+            {"error": "Provided template is not an XSD format."},
+        )
+
+    def test_ingestxml_without_template_or_sheet_returns_400(self):
+        """test_ingestxml_without_template_or_sheet_returns_400"""
+        for data in [{"sheet": "Columns"}, {"sheet": "A", "template_id": "1"}]:
+            response = curate_user_ajax.ingestxml(self._post(data))
+
+            self.assertEqual(response.status_code, 400)
+
+
+class TestSaveXmlDataBatchView(TestCase):
+    """Unit tests for `save_xml_data_batch` method."""
+
+    def setUp(self):
+        """setUp"""
+        self.factory = RequestFactory()
+        self.user = create_mock_user(user_id="1", has_perm=True)
+        self.saved = []
+
+    def _post(self, records):
+        """Build a save_xml_data_batch request
+
+        Args:
+            records:
+
+        Returns:
+
+        """
+        request = self.factory.post(
+            "core_curate_save_xml_data_batch", {"records": json.dumps(records)}
+        )
+        request.user = self.user
+        return request
+
+    @patch.object(Data, "save_object", autospec=True)
+    @patch.object(curate_user_ajax, "data_api")
+    @patch.object(curate_user_ajax, "template_api")
+    def test_save_xml_data_batch_returns_data_ids_in_order(
+        self, mock_template_api, mock_data_api, mock_save_object
+    ):
+        """test_save_xml_data_batch_returns_data_ids_in_order"""
+        mock_template_api.get_by_id.return_value = _get_template()
+        mock_data_api.upsert.side_effect = _mock_upsert(self.saved)
+
+        response = curate_user_ajax.save_xml_data_batch(
+            self._post(
+                [
+                    {"xml_data": "<tag/>", "title": "A", "template_id": "1"},
+                    {"xml_data": "<tag/>", "title": "B", "template_id": "1"},
+                ]
+            )
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            json.loads(response.content), {"data_ids": ["1", "2"]}
+        )
+        self.assertEqual(self.saved, ["A", "B"])
+        self.assertEqual(mock_template_api.get_by_id.call_count, 1)
+        self.assertEqual(
+            [
+                (call.args[0].title, call.args[0].file.name)
+                for call in mock_save_object.call_args_list
+            ],
+            [("A_AMUID1", "A_AMUID1"), ("B_AMUID2", "B_AMUID2")],
+        )
+
+    @patch.object(Data, "convert_to_dict", autospec=True)
+    @patch.object(Data, "save_object", autospec=True)
+    @patch.object(curate_user_ajax, "data_api")
+    @patch.object(curate_user_ajax, "template_api")
+    def test_save_xml_data_batch_converts_each_record_to_dict_once(
+        self,
+        mock_template_api,
+        mock_data_api,
+        mock_save_object,
+        mock_convert_to_dict,
+    ):
+        """test_save_xml_data_batch_converts_each_record_to_dict_once"""
+        mock_template_api.get_by_id.return_value = _get_template()
+        upsert = _mock_upsert(self.saved)
+
+        def convert_and_upsert(data, request):
+            data.convert_and_save()
+            return upsert(data, request)
+
+        mock_data_api.upsert.side_effect = convert_and_upsert
+        saved_titles = []
+        mock_save_object.side_effect = lambda data: saved_titles.append(
+            data.title
+        )
+
+        response = curate_user_ajax.save_xml_data_batch(
+            self._post(
+                [
+                    {"xml_data": "<tag/>", "title": "A", "template_id": "1"},
+                    {"xml_data": "<tag/>", "title": "B", "template_id": "1"},
+                ]
+            )
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(mock_convert_to_dict.call_count, 2)
+        self.assertEqual(saved_titles, ["A", "A_AMUID1", "B", "B_AMUID2"])
+
+    @patch.object(Data, "save_object")
+    @patch.object(curate_user_ajax, "data_api")
+    @patch.object(curate_user_ajax, "template_api")
+    def test_save_xml_data_batch_returns_400_if_a_record_fails(
+        self, mock_template_api, mock_data_api, mock_save_object
+    ):
+        """test_save_xml_data_batch_returns_400_if_a_record_fails"""
+        mock_template_api.get_by_id.return_value = _get_template()
+        upsert = _mock_upsert(self.saved)
+
+        def upsert_or_fail(data, request):
+            if data.title == "B":
+                raise Exception("Unable to save data")
+            return upsert(data, request)
+
+        mock_data_api.upsert.side_effect = upsert_or_fail
+
+        response = curate_user_ajax.save_xml_data_batch(
+            self._post(
+                [
+                    {"xml_data": "<tag/>", "title": "A", "template_id": "1"},
+                    {"xml_data": "<a/>", "title": "B", "template_id": "1"},
+                ]
+            )
+        )
+
+        self.assertIsInstance(response, HttpResponseBadRequest)
+        self.assertEqual(mock_save_object.call_count, 1)
+
+    @patch.object(curate_user_ajax, "data_api")
+    def test_save_xml_data_batch_with_invalid_records_returns_400(
+        self, mock_data_api
+    ):
+        """test_save_xml_data_batch_with_invalid_records_returns_400"""
+        for records in [
+            {},
+            [1],
+            [{"xml_data": "<tag/>", "title": "A"}],
+            [{"xml_data": "", "title": "A", "template_id": "1"}],
+        ]:
+            response = curate_user_ajax.save_xml_data_batch(
+                self._post(records)
+            )
+
+            self.assertIsInstance(response, HttpResponseBadRequest)
+        mock_data_api.upsert.assert_not_called()
+
+
+def _mock_upsert(saved):
+    """Return an upsert giving new data the next id and keeping their titles
+
+    Args:
+        saved: list of the titles of the saved data
+
+    Returns:
+
+    """
+
+    def upsert(data, request):
+        if data.pk is None:
+            data.pk = len(saved) + 1
+        saved.append(data.title)
+        return data
+
+    return upsert
+
+
 def _get_json_template():
     """Get JSON template
 